@@ -0,0 +1,54 @@
+"""
+Times single large experience grants levelled up through the linear and table curves against levelling one level at
+a time. That both give the same level, experience and ability points is checked by tests/test_experience_curve.py.
+
+Run from the repository root: python -m Benchmarks.experience_curve [--repeat N]
+"""
+import argparse
+import random
+import time
+
+from Data.Character.experience_curve import ExperienceCurve, LinearCurve, TableCurve
+from Data.Character.player import Player
+
+
+def levelOneAtATime(curve: ExperienceCurve, player: Player, experience: int):
+    """The level-up loop Player.addExperience used before experience curves."""
+    if not experience:
+        return
+    player.experience += abs(experience)
+    while player.experience >= curve.required(player.level):
+        player.experience -= curve.required(player.level)
+        player.level += 1
+        player.ability_points += Player.abilityPointsPerLevel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    curves = (LinearCurve(50), TableCurve([rng.randint(10, 500) for _ in range(40)]))
+    print("curve           grant  levels gained  one at a time (ms)  curve (ms)")
+    for curve in curves:
+        Player.setExperienceCurve(curve)
+        for grant in (10 ** 4, 10 ** 6, 10 ** 7):
+            timings = []
+            for level_up in (lambda player: levelOneAtATime(curve, player, grant),
+                             lambda player: player.addExperience(grant)):
+                best = float("inf")
+                for _ in range(args.repeat):
+                    player = Player()
+                    start = time.perf_counter()
+                    level_up(player)
+                    best = min(best, time.perf_counter() - start)
+                timings.append(best)
+            print("{:12}  {:8d}  {:13d}  {:18.3f}  {:10.3f}".format(type(curve).__name__, grant, player.level - 1,
+                                                                 timings[0] * 1000, timings[1] * 1000))
+    Player.setExperienceCurve(curves[0])
+
+
+if __name__ == "__main__":
+    main()
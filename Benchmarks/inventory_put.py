@@ -0,0 +1,82 @@
+"""
+Times putting item refs into a large inventory, comparing the original name-based ordering
+(a deep copy of both items per comparison) with the catalog's name-ordinal sort keys.
+
+Run from the repository root: python -m Benchmarks.inventory_put [--items N] [--refs N]
+"""
+import argparse
+import bisect
+import copy
+import os
+import random
+import tempfile
+import time
+
+from Data.Item.inventory import Inventory
+from Data.Item.item import Item
+from Data.Item.item_catalog import ItemCatalog
+from Data.Item.item_database import ItemDatabase
+from Data.Item.item_reference import ItemRef
+
+
+class LegacyRef(ItemRef):
+    """Orders refs the way ItemRef did before sort keys: deep copies compared by name."""
+    items: list[Item] = []
+
+    def __lt__(self, other):
+        return copy.deepcopy(LegacyRef.items[self.id]).__lt__(copy.deepcopy(LegacyRef.items[other.id]))
+
+
+def legacyPut(item_refs: list[ItemRef], *item_references: ItemRef):
+    for item_reference in item_references:
+        try:
+            index = item_refs.index(item_reference)
+            item_refs[index].quantity += item_reference.quantity
+        except ValueError:
+            bisect.insort(item_refs, item_reference)
+
+
+def syntheticItems(count: int, rng: random.Random):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return [Item("".join(rng.choice(letters) for _ in range(12)), rng.choice(["food", "key", "misc"]))
+            for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=20000, help="synthetic catalog size")
+    parser.add_argument("--refs", type=int, default=10000, help="item refs to put")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    items = syntheticItems(args.items, rng)
+    ids = [rng.randrange(args.items) for _ in range(args.refs)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        catalog_path = os.path.join(directory, "items.catalog")
+        ItemCatalog.compile(items, catalog_path)
+        ItemDatabase.open(catalog_path)
+
+        LegacyRef.items = items
+        legacy: list[ItemRef] = []
+        start = time.perf_counter()
+        for db_id in ids:
+            legacyPut(legacy, LegacyRef(db_id, 1))
+        before = time.perf_counter() - start
+
+        inventory = Inventory(capacity=args.refs)
+        inventory.setOnModified(lambda change: None)
+        start = time.perf_counter()
+        for db_id in ids:
+            inventory.put(ItemRef(db_id, 1))
+        after = time.perf_counter() - start
+
+        assert [ref.id for ref in legacy] == [ref.id for ref in inventory.itemRefs]
+        print("refs: {}, stacks: {}".format(args.refs, len(inventory)))
+        print("before (deep copy per comparison): {:.3f}s".format(before))
+        print("after (name ordinal sort keys):    {:.3f}s".format(after))
+
+
+if __name__ == "__main__":
+    main()
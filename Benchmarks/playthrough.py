@@ -0,0 +1,321 @@
+"""
+Plays worlds headlessly with bots and reports how fast the game logic runs: actions per second, memory allocated per
+action and peak RSS. Each action lists the available actions of the current scene, checking their requirements, and
+selects one through SceneManager.selectAction, which consumes required items and distributes rewards into the
+inventory. Before each action a bot with ability points to spend raises one score by a point. A bot starts a new
+game when no action is available, and after a fixed number of actions so that small worlds keep paying out rewards.
+
+Two bots play each world. The random bot selects any available action and raises any ability. The scripted bot
+follows fixed rules, so its playthrough is the same on every run. It first takes the actions that stay in the scene
+and that it has not selected yet, then heads for a scene it has not visited this game, else returns to the previous
+scene, else takes the first available action. It raises the ability that the current scene's first unmet
+requirement falls furthest short on, else strength.
+
+The shipped world (Data/scenes.json with Data/items.json) and synthetic worlds of the given sizes are played, each
+bot and world in a fresh interpreter so the peak RSS is its own. Memory is measured with tracemalloc in a separate
+playthrough: the bytes and blocks still allocated per action afterwards, and the peak above the start. Results can
+be written as json and compared against a previous run's json to track regressions between commits.
+
+Run from the repository root: python -m Benchmarks.playthrough [--synthetic N [N ...]] [--actions N] [--game-length N]
+    [--repeat N] [--json PATH] [--compare PATH] [--fail-slower PERCENT]
+With --json - the report is written to stdout and the table to stderr.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from Benchmarks.synthetic import writeWorld
+from Data.Character.character import Character
+from Data.Character.player import Player
+from Data.Item.inventory import Inventory
+from Data.Item.item_database import ItemDatabase
+from Data.Scene.manager import SceneManager
+from Data.Scene.requirement import RequirementPredicate
+from Data.Scene.reward import Reward
+from Data.Scene.world_bundle import WorldBundle
+
+_counted = (("requirementChecks", RequirementPredicate, "met"), ("rewards", Reward, "distribute"),
+            ("itemsPut", Inventory, "put"), ("itemsUsed", Inventory, "use"))
+
+
+class RandomBot:
+    name = "random"
+
+    def __init__(self, seed: int):
+        self._rng = random.Random(seed)
+
+    def choose(self, manager: SceneManager, available: list[int]) -> int:
+        return self._rng.choice(available)
+
+    def restart(self):
+        pass
+
+    def spend(self, player: Player, manager: SceneManager):
+        player.modifyAbilityScore(self._rng.choice(Character.abilityNames()), 1)
+
+
+class ScriptedBot:
+    name = "scripted"
+
+    def __init__(self, seed: int):
+        self._visited = {0}
+
+    def choose(self, manager: SceneManager, available: list[int]) -> int:
+        actions = manager.current().actions
+        for index in available:
+            if actions[index].id < -1 and not manager.actionSelected(index):
+                return index
+        for index in available:
+            target = actions[index].id
+            if target >= 0 and target not in self._visited:
+                self._visited.add(target)
+                return index
+        for index in available:
+            if actions[index].id == -1:
+                return index
+        return available[0]
+
+    def restart(self):
+        self._visited = {0}
+
+    def spend(self, player: Player, manager: SceneManager):
+        for action in manager.current().actions:
+            if action.requirement and action.requirement.abilities and not action.requirementMet(player):
+                shortfalls = [(ability.score - player.scores[Character.abilityId(ability.name)], ability.name)
+                              for ability in action.requirement.abilities]
+                shortfall, name = max(shortfalls)
+                if shortfall > 0:
+                    player.modifyAbilityScore(name, 1)
+                    return
+        player.modifyAbilityScore(Character.abilityNames()[0], 1)
+
+
+_bots = {bot.name: bot for bot in (RandomBot, ScriptedBot)}
+
+
+def play(world_path: str, bot, actions: int, game_length: int):
+    """
+    Plays a world until a number of actions have been selected.
+    :param world_path: The scenes file.
+    :param bot: The bot choosing the actions.
+    :param actions: The number of actions to select.
+    :param game_length: The number of actions after which a new game is started.
+    :return: The number of new games started, and the player and scene manager, so that what they hold is kept.
+    """
+    player = Player(inventory=Inventory())
+    manager = SceneManager(player, world_path)
+    restarts = 0
+    selected = 0
+    game_selected = 0
+    while selected < actions:
+        if player.ability_points > 0:
+            bot.spend(player, manager)
+        available = [index for index in range(len(manager.current().actions)) if manager.actionAvailable(index)]
+        if not available or game_selected == game_length:
+            if not game_selected:
+                raise RuntimeError("no action is available in the first scene of '{}'".format(world_path))
+            player.resetAttributes()
+            manager.copyAttributes(None)
+            bot.restart()
+            restarts += 1
+            game_selected = 0
+            continue
+        manager.selectAction(bot.choose(manager, available))
+        selected += 1
+        game_selected += 1
+    return restarts, player, manager
+
+
+def countCalls(function):
+    """
+    Counts the calls a function makes to the requirement, reward and inventory methods that actions go through.
+    :return: What the function returns, and the number of calls by method.
+    """
+    counts = dict.fromkeys([name for name, _, _ in _counted], 0)
+    originals = [(owner, method, getattr(owner, method)) for _, owner, method in _counted]
+
+    def counting(name: str, original):
+        def counted(*args, **kwargs):
+            counts[name] += 1
+            return original(*args, **kwargs)
+        return counted
+
+    for (name, _, _), (owner, method, original) in zip(_counted, originals):
+        setattr(owner, method, counting(name, original))
+    try:
+        result = function()
+    finally:
+        for owner, method, original in originals:
+            setattr(owner, method, original)
+    return result, counts
+
+
+def tracedAllocations(function) -> tuple[int, int, int]:
+    """
+    Measures the memory a function leaves allocated, and its peak.
+    :return: The bytes and blocks still allocated after the function, and the peak bytes above the start.
+    """
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    kept = function()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    retained_blocks = sys.getallocatedblocks() - blocks
+    del kept
+    return current - start, retained_blocks, peak - start
+
+
+def peakRss():
+    """
+    The peak resident set size of this process in bytes, or None where it cannot be read. On Linux it is read from
+    /proc, because getrusage's peak is carried over from the parent through fork and exec.
+    """
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def runWorker(world_path: str, bot_name: str, actions: int, game_length: int, repeat: int, seed: int) -> dict:
+    """Plays one world with one bot, in this process, and returns the measurements."""
+    start = time.perf_counter()
+    ItemDatabase.initialize()
+    scenes = len(SceneManager.world(world_path))
+    load_seconds = time.perf_counter() - start
+
+    bot = _bots[bot_name]
+    (restarts, _, _), calls = countCalls(lambda: play(world_path, bot(seed), actions, game_length))
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        play(world_path, bot(seed), actions, game_length)
+        best = min(best, time.perf_counter() - start)
+    retained_bytes, retained_blocks, peak_traced = tracedAllocations(
+        lambda: play(world_path, bot(seed), actions, game_length))
+    return {"world": os.path.basename(world_path), "scenes": scenes, "bot": bot_name, "actions": actions,
+            "gameLength": game_length, "restarts": restarts, "loadSeconds": load_seconds, "seconds": best,
+            "actionsPerSecond": actions / best,
+            "callsPerAction": {name: count / actions for name, count in calls.items()},
+            "retainedBytesPerAction": retained_bytes / actions, "retainedBlocksPerAction": retained_blocks / actions,
+            "peakTracedBytes": peak_traced, "peakRssBytes": peakRss()}
+
+
+def runIsolated(world_path: str, bot_name: str, args) -> dict:
+    """Plays one world with one bot in a fresh interpreter and returns its measurements."""
+    output = subprocess.run([sys.executable, "-m", "Benchmarks.playthrough", "--worker", world_path, bot_name,
+                             "--actions", str(args.actions), "--game-length", str(args.game_length),
+                             "--repeat", str(args.repeat), "--seed", str(args.seed)],
+                            capture_output=True, text=True)
+    if output.returncode:
+        raise RuntimeError("playing '{}' with the {} bot failed:\n{}".format(world_path, bot_name, output.stderr))
+    return json.loads(output.stdout.splitlines()[-1])
+
+
+def commit():
+    """The checked out commit, or None outside a git work tree."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: list[dict], baseline_path: str, out) -> float:
+    """
+    Prints the change in actions per second against a previous run.
+    :param out: The stream to print to.
+    :return: The largest slowdown in percent, or 0 if nothing got slower.
+    """
+    with open(baseline_path, 'r') as baseline_file:
+        baseline = json.load(baseline_file)
+    previous = {(result["world"], result["bot"]): result for result in baseline["results"]}
+    print("compared with {} ({})".format(baseline_path, baseline.get("commit") or "unknown commit"), file=out)
+    slowest = 0.0
+    for result in results:
+        before = previous.get((result["world"], result["bot"]))
+        if not before:
+            continue
+        change = (result["actionsPerSecond"] / before["actionsPerSecond"] - 1) * 100
+        slowest = max(slowest, -change)
+        print("{:24} {:9}  {:10.0f} -> {:10.0f} actions/s  {:+6.1f}%".format(
+            result["world"], result["bot"], before["actionsPerSecond"], result["actionsPerSecond"], change), file=out)
+    return slowest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--synthetic", type=int, nargs="*", default=[1000, 20000], metavar="SCENES",
+                        help="the sizes of the synthetic worlds to play")
+    parser.add_argument("--actions", type=int, default=20000, help="actions selected per playthrough")
+    parser.add_argument("--game-length", type=int, default=200, help="actions per game before starting a new one")
+    parser.add_argument("--repeat", type=int, default=3, help="timed playthroughs, of which the fastest counts")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="PATH", help="write the results as json, or to stdout with -")
+    parser.add_argument("--compare", metavar="PATH", help="a json file written by an earlier run")
+    parser.add_argument("--fail-slower", type=float, metavar="PERCENT",
+                        help="exit with status 1 if any playthrough is this much slower than in --compare")
+    parser.add_argument("--worker", nargs=2, metavar=("WORLD", "BOT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(runWorker(*args.worker, args.actions, args.game_length, args.repeat, args.seed)))
+        return
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        worlds = [SceneManager.defaultPath()]
+        for scenes in args.synthetic:
+            worlds.append(os.path.join(directory, "synthetic-{}.json".format(scenes)))
+            writeWorld(worlds[-1], scenes, args.seed)
+            WorldBundle.open(worlds[-1])  # compiled here, so the playthroughs only time opening it
+        for world_path in worlds:
+            for bot_name in _bots:
+                results.append(runIsolated(world_path, bot_name, args))
+
+    out = sys.stderr if args.json == "-" else sys.stdout  # keeps stdout valid json when the report goes there
+    print("{:24} {:9} {:>8} {:>11} {:>9} {:>11} {:>10} {:>9}".format(
+        "world", "bot", "scenes", "actions/s", "restarts", "B/action", "peak kB", "RSS MB"), file=out)
+    for result in results:
+        rss = result["peakRssBytes"]
+        print("{:24} {:9} {:8d} {:11.0f} {:9d} {:11.1f} {:10.0f} {:>9}".format(
+            result["world"], result["bot"], result["scenes"], result["actionsPerSecond"], result["restarts"],
+            result["retainedBytesPerAction"], result["peakTracedBytes"] / 1024,
+            "{:.1f}".format(rss / 2 ** 20) if rss else "-"), file=out)
+
+    report = {"commit": commit(), "time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+              "python": platform.python_version(), "platform": platform.platform(), "actions": args.actions,
+              "gameLength": args.game_length, "repeat": args.repeat, "seed": args.seed, "results": results}
+    if args.json == "-":
+        print(json.dumps(report, indent=4))
+    elif args.json:
+        with open(args.json, 'w') as report_file:
+            json.dump(report, report_file, indent=4)
+
+    if args.compare:
+        slowest = compare(results, args.compare, out)
+        if args.fail_slower is not None and slowest > args.fail_slower:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
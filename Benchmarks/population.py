@@ -0,0 +1,82 @@
+"""
+Compares the time of batch operations on a NumPy Population against looping over the same characters as Player
+objects. That both give the same results is checked by tests/test_population.py.
+
+Run from the repository root: python -m Benchmarks.population [--size N] [--repeat N]
+"""
+import argparse
+import random
+import time
+
+import numpy
+
+from Data.Character.ability import Ability
+from Data.Character.character import Character
+from Data.Character.player import Player
+from Data.Character.population import Population
+from Data.Scene.requirement import Requirement
+
+
+def syntheticPlayers(size: int, rng: random.Random) -> list[Player]:
+    players = []
+    for _ in range(size):
+        player = Player(level=rng.randint(1, 30), experience=rng.randrange(50), ability_points=rng.randint(0, 20))
+        for ability_id in range(len(Character.abilityNames())):
+            # mostly hundredths, which land on rounding ties, and some arbitrary doubles
+            score = rng.randint(0, 1000) / 100 if rng.random() < 0.8 else rng.uniform(0, 10)
+            player.setAbilityScore(ability_id, score)
+        players.append(player)
+    return players
+
+
+def timeBest(function, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=100000, help="characters in the population")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    players = syntheticPlayers(args.size, rng)
+    population = Population.fromPlayers(players)
+    requirement = [Ability("strength", "", 5), Ability("wisdom", "", 3)]
+    predicate = Requirement(requirement).compile()
+    grants = numpy.array([rng.randrange(2000) for _ in players])
+
+    def scalarStats():
+        for player in players:
+            player._derived = None
+            player.craftingBonus(), player.dodgeBonus(), player.enchantingBonus(), player.runBonus()
+            player.powerLevel()
+
+    def batchStats():
+        population.craftingBonus(), population.dodgeBonus(), population.enchantingBonus(), population.runBonus()
+        population.powerLevel()
+
+    def scalarExperience():
+        for player, experience in zip(players, grants.tolist()):
+            player.addExperience(experience)
+
+    cases = (("derived stats", scalarStats, batchStats),
+             ("requirement", lambda: [predicate.met(player) for player in players],
+              lambda: population.meets(requirement)),
+             ("add experience", scalarExperience, lambda: population.addExperience(grants)))
+    print("operation       players (ms)  population (ms)  speedup")
+    for name, scalar, batch in cases:
+        scalar_time = timeBest(scalar, args.repeat)
+        batch_time = timeBest(batch, args.repeat)
+        print("{:14}  {:12.1f}  {:15.1f}  {:6.1f}x".format(name, scalar_time * 1000, batch_time * 1000,
+                                                       scalar_time / batch_time))
+
+
+if __name__ == "__main__":
+    main()
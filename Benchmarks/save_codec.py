@@ -0,0 +1,73 @@
+"""
+Compares json and binary saves: write and load latency and file size, for a player with a large inventory and a
+long scene history.
+
+Run from the repository root: python -m Benchmarks.save_codec [--items N] [--history N] [--repeat N]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from Benchmarks.inventory_put import syntheticItems
+from Data.Game.engine import Engine
+from Data.Item.inventory import Inventory
+from Data.Item.item_catalog import ItemCatalog
+from Data.Item.item_database import ItemDatabase
+from Data.Item.item_reference import ItemRef
+
+
+def syntheticEngine(items: int, history: int, rng: random.Random) -> Engine:
+    engine = Engine()
+    engine.player.name = "Benchmark"
+    item_references = [ItemRef(db_id, rng.randint(1, 99)) for db_id in rng.sample(range(items), items // 2)]
+    engine.player.inventory.copyAttributes(Inventory(len(item_references), rng.randint(0, 10 ** 6), item_references))
+    manager = engine.sceneManager
+    manager.previousAreaIndexes = [rng.randrange(history) for _ in range(history)]
+    for scene_index in range(history):
+        for action_index in rng.sample(range(15), 3):
+            manager.progress.select(scene_index, action_index)
+    return engine
+
+
+def timeSaves(engine: Engine, path: str, binary: bool, repeat: int):
+    save_times = []
+    load_times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        engine.save(path, binary)
+        save_times.append(time.perf_counter() - start)
+        loaded = Engine()
+        start = time.perf_counter()
+        loaded.load(path)
+        load_times.append(time.perf_counter() - start)
+        loaded.detach()
+    engine.detach()
+    return min(save_times), min(load_times), os.path.getsize(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=20000, help="synthetic catalog size, half of it carried")
+    parser.add_argument("--history", type=int, default=20000, help="visited scenes and scenes with selections")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        catalog_path = os.path.join(directory, "items.catalog")
+        ItemCatalog.compile(syntheticItems(args.items, rng), catalog_path)
+        ItemDatabase.open(catalog_path)
+        engine = syntheticEngine(args.items, args.history, rng)
+
+        print("format  save (ms)  load (ms)  size (bytes)")
+        for name, binary in (("json", False), ("binary", True)):
+            path = os.path.join(directory, "Benchmark.{}".format(name))
+            save_time, load_time, size = timeSaves(engine, path, binary, args.repeat)
+            print("{:6}  {:9.1f}  {:9.1f}  {:12d}".format(name, save_time * 1000, load_time * 1000, size))
+
+
+if __name__ == "__main__":
+    main()
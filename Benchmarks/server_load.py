@@ -0,0 +1,110 @@
+"""
+Drives simulated clients through a running game server and reports throughput and latency. Each client starts a
+new game, then repeatedly lists the scene actions and selects a random available one, starting over when it
+reaches a dead end.
+
+Run from the repository root: python -m Benchmarks.server_load [--clients N] [--actions N] [--port PORT]
+Without --port a server is started in a subprocess on a free port.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+
+class Client:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self.latencies: list[float] = []
+
+    async def request(self, line: str):
+        start = time.perf_counter()
+        self._writer.write((line + "\n").encode("utf-8"))
+        await self._writer.drain()
+        response = json.loads(await self._reader.readline())
+        self.latencies.append(time.perf_counter() - start)
+        if not response["ok"]:
+            raise RuntimeError(response["error"])
+        return response["result"]
+
+    async def close(self):
+        self._writer.write(b"quit\n")
+        self._writer.close()
+        await self._writer.wait_closed()
+
+
+async def play(host: str, port: int, name: str, actions: int, rng: random.Random):
+    client = Client(*await asyncio.open_connection(host, port))
+    await client.request("new {}".format(name))
+    scene_actions = await client.request("actions")
+    for _ in range(actions):
+        available = [action["index"] for action in scene_actions if action["available"]]
+        if not available:
+            await client.request("new {}".format(name))
+            scene_actions = await client.request("actions")
+            continue
+        scene_actions = (await client.request("select {}".format(rng.choice(available))))["actions"]
+    await client.close()
+    return client.latencies
+
+
+def cpuSeconds(pid: int):
+    """Reads a process's user + system time on Linux, or None elsewhere."""
+    try:
+        with open("/proc/{}/stat".format(pid)) as stat:
+            fields = stat.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+async def run(args):
+    rng = random.Random(args.seed)
+    start = time.perf_counter()
+    results = await asyncio.gather(*(play(args.host, args.port, "Bot{}".format(index), args.actions,
+                                          random.Random(rng.random())) for index in range(args.clients)))
+    elapsed = time.perf_counter() - start
+    latencies = sorted(latency for client in results for latency in client)
+    return elapsed, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--actions", type=int, default=200, help="selections per client")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = None
+    if args.port is None:
+        server = subprocess.Popen([sys.executable, "text_rpg_server.py", "--port", "0"], stdout=subprocess.PIPE,
+                                  text=True)
+        args.port = int(server.stdout.readline().rsplit(":", 1)[1])
+    try:
+        cpu_before = cpuSeconds(server.pid) if server else None
+        elapsed, latencies = asyncio.run(run(args))
+        cpu_after = cpuSeconds(server.pid) if server else None
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    requests = len(latencies)
+    print("clients: {}, requests: {}, elapsed: {:.2f}s".format(args.clients, requests, elapsed))
+    print("throughput: {:.0f} requests/s".format(requests / elapsed))
+    print("latency p50: {:.2f}ms, p99: {:.2f}ms".format(latencies[requests // 2] * 1000,
+                                                       latencies[min(requests - 1, int(requests * 0.99))] * 1000))
+    if cpu_before is not None and cpu_after is not None and cpu_after > cpu_before:
+        print("server cpu: {:.2f}s, {:.0f} requests per cpu-second".format(cpu_after - cpu_before,
+                                                                          requests / (cpu_after - cpu_before)))
+
+
+if __name__ == "__main__":
+    main()
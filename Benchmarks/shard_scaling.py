@@ -0,0 +1,56 @@
+"""
+Measures how session throughput scales with the number of worker processes. Every session plays a random walk:
+list the scene actions, select a random available one, and start over at dead ends.
+
+Run from the repository root: python -m Benchmarks.shard_scaling [--workers N] [--sessions N] [--rounds N]
+"""
+import argparse
+import os
+import random
+import time
+
+from Data.Server.shard import ShardedRunner
+
+
+def walk(runner: ShardedRunner, sessions: list[str], rounds: int, rng: random.Random):
+    runner.requestMany([(session, "new {}".format(session)) for session in sessions])
+    actions = runner.requestMany([(session, "actions") for session in sessions])
+    requests = 2 * len(sessions)
+    for _ in range(rounds):
+        selections = []
+        for session, response in zip(sessions, actions):
+            available = [action["index"] for action in response["result"] if action["available"]]
+            selections.append((session, "select {}".format(rng.choice(available)) if available else "new"))
+        responses = runner.requestMany(selections)
+        requests += len(selections)
+        restarted = [session for session, (_, line) in zip(sessions, selections) if line == "new"]
+        restarted_actions = iter(runner.requestMany([(session, "actions") for session in restarted]))
+        requests += len(restarted)
+        actions = []
+        for (_, line), response in zip(selections, responses):
+            actions.append(next(restarted_actions) if line == "new" else {"result": response["result"]["actions"]})
+    return requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="largest worker count to try")
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    sessions = ["Session{}".format(index) for index in range(args.sessions)]
+    baseline = None
+    print("workers  requests/s  speedup")
+    for workers in range(1, args.workers + 1):
+        with ShardedRunner(workers) as runner:
+            start = time.perf_counter()
+            requests = walk(runner, sessions, args.rounds, random.Random(args.seed))
+            throughput = requests / (time.perf_counter() - start)
+        baseline = baseline or throughput
+        print("{:7d}  {:10.0f}  {:6.2f}x".format(workers, throughput, throughput / baseline))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Times starting the game up to the first paint of the main menu, which is what a player waits through before they can
+click anything. Each run starts a fresh interpreter with the offscreen Qt platform, so imports, window construction
+and whatever runs before the event loop are all counted; the run ends at the main menu's first paint event.
+
+Run from the repository root: python -m Benchmarks.startup [--repeat N]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+_driver = """
+import os, sys, time
+from PyQt5 import QtCore, QtWidgets
+
+class FirstPaint(QtCore.QObject):
+    def eventFilter(self, watched, event):
+        if event.type() == QtCore.QEvent.Paint and watched.objectName() == "MainWindow":
+            print(time.time(), flush=True)
+            os._exit(0)
+        return False
+
+app = QtWidgets.QApplication(sys.argv)
+first_paint = FirstPaint()
+app.installEventFilter(first_paint)
+sys.argv = ["text_rpg.py"]
+exec(compile(open("text_rpg.py").read(), "text_rpg.py", "exec"))
+"""
+
+
+def firstPaint() -> float:
+    """Starts the game in a new interpreter and returns the seconds until the main menu is first painted."""
+    environment = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    start = time.time()
+    output = subprocess.run([sys.executable, "-c", _driver], env=environment, capture_output=True, text=True,
+                            timeout=60)
+    if output.returncode or not output.stdout.strip():
+        raise RuntimeError("the main menu was never painted:\n" + output.stderr)
+    return float(output.stdout.split()[-1]) - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    firstPaint()  # warms the file cache and bytecode
+    times = [firstPaint() for _ in range(args.repeat)]
+    print("time to first paint of the main menu over {} runs (ms)".format(args.repeat))
+    print("best {:7.1f}  median {:7.1f}  worst {:7.1f}".format(min(times) * 1000, statistics.median(times) * 1000,
+                                                                max(times) * 1000))
+
+
+if __name__ == "__main__":
+    main()
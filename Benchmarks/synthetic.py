@@ -0,0 +1,91 @@
+"""
+Writes a synthetic world in the scenes.json format the editor saves, for benchmarks and for trying the content tools
+on worlds far larger than the shipped one. Most scenes lead on to the next and jump ahead at random; some actions
+stay in the scene for a reward, some return, some need abilities or items, and a few scenes are dead ends or are
+never linked to.
+
+Run from the repository root: python -m Benchmarks.synthetic --scenes N --out PATH [--seed N]
+"""
+import argparse
+import json
+import random
+
+from Data.Character.character import Character
+
+_actionMeta = {"classes": {"/": "Data.Scene.action.Action", "/requirement": "Data.Scene.requirement.Requirement",
+                           "/reward": "Data.Scene.reward.Reward"}, "dump_time": "2022-10-13T19:00:53Z"}
+_abilityMeta = {"classes": {"/": "Data.Character.ability.Ability"}, "dump_time": "2022-10-13T19:00:53Z"}
+_itemMeta = {"classes": {"/": "Data.Item.item_reference.ItemRef"}, "dump_time": "2022-10-13T19:00:53Z"}
+_sceneMeta = {"classes": {"/": "Data.Scene.scene.Scene"}, "dump_time": "2022-10-13T19:00:53Z"}
+_words = ("ancient", "cave", "dark", "forest", "gate", "hill", "lake", "moss", "path", "river", "ruin", "stone",
+          "tower", "wind", "wood")
+
+
+def _action(description: str, target: int, requirement: dict = None, reward: dict = None, disable=False) -> dict:
+    return {"-meta": _actionMeta, "description": description, "disableOnSelect": disable, "enabled": True,
+            "id": target, "removeOnSelect": False, "removed": False,
+            "requirement": requirement or {"abilities": [], "items": []},
+            "reward": reward or {"experience": 0, "items": []}, "selected": False}
+
+
+def _requirement(rng: random.Random, items: int) -> dict:
+    if rng.random() < 0.5:
+        return {"abilities": [{"-meta": _abilityMeta, "description": "", "name": rng.choice(
+            Character.abilityNames()), "score": float(rng.randint(2, 9))}], "items": []}
+    return {"abilities": [], "items": [{"-meta": _itemMeta, "id": rng.randrange(items), "quantity": 1}]}
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_words) for _ in range(words)).capitalize() + "."
+
+
+def syntheticWorld(scenes: int, rng: random.Random, items: int = 4) -> list[dict]:
+    """
+    Generates the scenes of a synthetic world.
+    :param scenes: The number of scenes.
+    :param rng: The random source; the same seed gives the same world.
+    :param items: The number of item ids that requirements and rewards refer to.
+    :return: The scenes as json-ready dicts.
+    """
+    world = []
+    for index in range(scenes):
+        actions = []
+        if index + 1 < scenes and rng.random() < 0.97:  # the rest are dead ends, or only leave by returning
+            actions.append(_action("Go on to " + _text(rng, 2), index + 1))
+        for _ in range(rng.randint(0, 2)):
+            target = rng.randrange(scenes)
+            requirement = _requirement(rng, items) if rng.random() < 0.3 else None
+            actions.append(_action("Head for " + _text(rng, 3), target, requirement))
+        if rng.random() < 0.5:
+            reward = {"experience": rng.randint(5, 50), "items": [{"-meta": _itemMeta, "id": rng.randrange(
+                items), "quantity": rng.randint(1, 3)}]}
+            actions.append(_action("Search the " + _text(rng, 1), -777, reward=reward, disable=True))
+        if index and rng.random() < 0.5:
+            actions.append(_action("[ null ]", -1))
+        world.append({"-meta": _sceneMeta, "actions": actions, "enterDescription": _text(rng, 30),
+                      "exitDescription": _text(rng, 4), "imagePath": "", "name": _text(rng, 2)[:-1]})
+    return world
+
+
+def writeWorld(path: str, scenes: int, seed: int = 0):
+    """
+    Writes a synthetic world to a scenes file, compactly.
+    :param path: The scenes file.
+    :param scenes: The number of scenes.
+    :param seed: The random seed.
+    """
+    with open(path, "w") as scenes_file:
+        json.dump(syntheticWorld(scenes, random.Random(seed)), scenes_file, separators=(",", ":"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenes", type=int, default=100000)
+    parser.add_argument("--out", required=True, help="the scenes file to write")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    writeWorld(args.out, args.scenes, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Times loading a synthetic world: with jsons as SceneManager used to, from the scenes file with no bundle yet (cold:
+hash, parse and compile), with a fresh bundle (warm), after the scenes file was touched but not changed (hash), and
+decoding every scene of a warm bundle. Each bundle load includes reading the first scene. Then compares the memory
+held by decoded scenes after a random walk through the world with the memory of decoding all of it.
+
+Run from the repository root: python -m Benchmarks.world_bundle [--scenes N] [--repeat N] [--walk N] [--skip-jsons]
+"""
+import argparse
+import gc
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+import jsons
+
+from Benchmarks.synthetic import writeWorld
+from Data.Scene.world_bundle import WorldBundle
+
+
+def timeBest(function, repeat: int, setup=None) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def tracedMemory(function) -> int:
+    """The memory still allocated by what a function returns, in bytes."""
+    gc.collect()
+    tracemalloc.start()
+    kept = function()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenes", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--walk", type=int, default=2000, help="scenes visited in the random walk")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-jsons", action="store_true", help="skip the jsons baseline, which takes a while")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        source_path = os.path.join(directory, "scenes.json")
+        bundle_path = WorldBundle.bundlePath(source_path)
+        writeWorld(source_path, args.scenes, args.seed)
+
+        def removeBundle():
+            if os.path.exists(bundle_path):
+                os.remove(bundle_path)
+
+        def touchSource():
+            os.utime(source_path)
+
+        def loadJsons():
+            with open(source_path, 'r') as scenes_file:
+                return jsons.loads(scenes_file.read())
+
+        def loadAll():
+            return list(WorldBundle.open(source_path, capacity=args.scenes))
+
+        def walk():
+            world = WorldBundle.open(source_path)
+            rng = random.Random(args.seed)
+            for _ in range(args.walk):
+                world[rng.randrange(len(world))]
+            return world
+
+        timings = []
+        if not args.skip_jsons:
+            timings.append(("jsons", timeBest(loadJsons, 1)))
+        timings.append(("cold", timeBest(lambda: WorldBundle.open(source_path)[0], args.repeat, removeBundle)))
+        timings.append(("warm", timeBest(lambda: WorldBundle.open(source_path)[0], args.repeat)))
+        timings.append(("touched", timeBest(lambda: WorldBundle.open(source_path)[0], args.repeat, touchSource)))
+        timings.append(("all", timeBest(loadAll, args.repeat)))
+
+        print("{} scenes: scenes file {:.1f} MB, bundle {:.1f} MB".format(
+            args.scenes, os.path.getsize(source_path) / 2 ** 20, os.path.getsize(bundle_path) / 2 ** 20))
+        print("load     time (s)")
+        for name, seconds in timings:
+            print("{:7}  {:8.3f}".format(name, seconds))
+        print("decoded scenes held after a {}-scene walk: {:.1f} MB; with every scene decoded: {:.1f} MB".format(
+            args.walk, tracedMemory(walk) / 2 ** 20, tracedMemory(loadAll) / 2 ** 20))
+
+
+if __name__ == "__main__":
+    main()
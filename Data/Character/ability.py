@@ -1,4 +1,6 @@
 class Ability:
+    __slots__ = ("name", "description", "score")
+
     def __init__(self, name: str, description: str = "", score: float = 1.0,):
         self.name = name
         self.description = description
@@ -1,55 +1,103 @@
+import enum
 import math
 
 from Data.Character.ability import Ability
+from Data.Game.observable import Observable
 from Data.Item.inventory import Inventory
 from Data.Item.item_reference import ItemRef
 
 
-class Character:
+class AbilityId(enum.IntEnum):
+    """Slots of the ability scores, in name order."""
+    DEXTERITY = 0
+    INTELLIGENCE = 1
+    STRENGTH = 2
+    WILL = 3
+    WISDOM = 4
+
+
+class Character(Observable):
+    """
+    Ability scores are kept in a fixed list indexed by AbilityId. The derived stats are computed together on first
+    use and kept until a score changes.
+    """
+    __slots__ = ("inventory", "name", "scores", "_derived", "_observers")
+    __descriptions = ("Ability checks and run chance", "Ability checks and enchanting", "Ability checks and crafting",
+                      "Ability checks and crafting", "Ability checks and enchanting")
+    __ids = {variant: ability_id for ability_id in AbilityId  # the usual spellings, looked up without lower()
+             for variant in (ability_id.name, ability_id.name.lower(), ability_id.name.capitalize())}
     __round_digits = 2
 
     def __init__(self, name="", strength=1.0, dexterity=1.0, intelligence=1.0, will=1.0, wisdom=1.0,
-                 inventory=Inventory()):
-        self.abilities: dict[str, Ability] = {
-            "dexterity": Ability("dexterity", "Ability checks and run chance", dexterity),
-            "intelligence": Ability("intelligence", "Ability checks and enchanting", intelligence),
-            "strength": Ability("strength", "Ability checks and crafting", strength),
-            "will": Ability("will", "Ability checks and crafting", will),
-            "wisdom": Ability("wisdom", "Ability checks and enchanting", wisdom)}
-        self.inventory = inventory
+                 inventory: Inventory = None):
+        self.inventory = inventory if inventory is not None else Inventory()
         self.name = name
+        self.scores: list[float] = [dexterity, intelligence, strength, will, wisdom]
+        self._derived: tuple = None
+
+    @property
+    def abilities(self) -> dict[str, Ability]:
+        """A snapshot of the abilities by lowercase name; change scores through setAbilityScore."""
+        return {ability_id.name.lower(): Ability(ability_id.name.lower(), Character.__descriptions[ability_id],
+                                                 self.scores[ability_id]) for ability_id in AbilityId}
 
     def ability(self, name: str, context: str = "score"):
-        ability = self.abilities[name.lower()]
+        ability_id = Character.abilityId(name)
         if context == "score":
-            return ability.score
+            return self.scores[ability_id]
         elif context == "description":
-            return ability.description
+            return Character.__descriptions[ability_id]
         else:
-            return ability.name
+            return ability_id.name.lower()
+
+    @staticmethod
+    def abilityId(name: str) -> AbilityId:
+        """
+        Resolves an ability name in any case to its slot.
+        :param name: The ability name.
+        :return: The ability's slot; raises KeyError for unknown names.
+        """
+        ability_id = Character.__ids.get(name)
+        return ability_id if ability_id is not None else Character.__ids[name.lower()]
+
+    @staticmethod
+    def abilityNames() -> tuple[str, ...]:
+        """The lowercase ability names, in slot order."""
+        return tuple(ability_id.name.lower() for ability_id in AbilityId)
 
     def craftingBonus(self):
-        bonus = self.ability("will")
-        bonus += self.ability("strength") / 2.0
-        return round(bonus, Character.__round_digits)
+        return self._derivedStats()[0]
+
+    def _derivedStats(self) -> tuple:
+        """Computes the crafting, dodge, enchanting and run bonuses and the power level, once per change of scores."""
+        if self._derived is None:
+            dexterity, intelligence, strength, will, wisdom = self.scores
+            digits = Character.__round_digits
+            self._derived = (round(will + strength / 2.0, digits), round(dexterity + wisdom, digits),
+                             round(wisdom + intelligence / 2.0, digits), round(dexterity + will, digits),
+                             math.floor(intelligence + dexterity + strength + will + wisdom))
+        return self._derived
 
     def dodgeBonus(self):
-        bonus = self.ability("dexterity") + self.ability("wisdom")
-        return round(bonus, Character.__round_digits)
+        return self._derivedStats()[1]
 
     def enchantingBonus(self):
-        bonus = self.ability("wisdom")
-        bonus += self.ability("intelligence") / 2.0
-        return round(bonus, Character.__round_digits)
+        return self._derivedStats()[2]
 
     def powerLevel(self):
-        return math.floor(
-            self.ability("intelligence") + self.ability("dexterity") + self.ability("strength") + self.ability(
-                "will") + self.ability("wisdom"))
+        return self._derivedStats()[4]
 
     def runBonus(self):
-        bonus = self.ability("dexterity") + self.ability("will")
-        return round(bonus, Character.__round_digits)
+        return self._derivedStats()[3]
+
+    def setAbilityScore(self, ability: AbilityId, score: float):
+        """
+        Sets an ability score without any checks.
+        :param ability: The ability's slot.
+        :param score: The new score.
+        """
+        self.scores[ability] = score
+        self._derived = None
 
     def use(self, item_id: int = None, quantity: int = 1, item_reference: ItemRef = None):
         if item_id is not None:
@@ -0,0 +1,101 @@
+import abc
+import bisect
+import math
+
+
+class ExperienceCurve(abc.ABC):
+    """
+    How much experience each level needs. A curve only has to define required(); total() and level() walk it one
+    level at a time unless a subclass can answer them directly, which makes advance() fast for any grant.
+    """
+
+    def advance(self, level: int, experience):
+        """
+        Applies experience that may be worth several levels at once.
+        :param level: The current level.
+        :param experience: The experience towards the next level, which may exceed what that level requires.
+        :return: The new level and the experience left towards the one after it.
+        """
+        if not isinstance(experience, int) or level < 1:  # keep the exact arithmetic of levelling one at a time
+            while experience >= self.required(level) > 0:
+                experience -= self.required(level)
+                level += 1
+            return level, experience
+        total = self.total(level) + experience
+        new_level = max(level, self.level(total))
+        return new_level, total - self.total(new_level)
+
+    def level(self, total: int) -> int:
+        """
+        :param total: Experience earned since level 1.
+        :return: The highest level that much experience reaches.
+        """
+        level = 1
+        while True:
+            required = self.required(level)
+            if required <= 0 or total < required:
+                return level
+            total -= required
+            level += 1
+
+    @abc.abstractmethod
+    def required(self, level: int):
+        """
+        :param level: The current level.
+        :return: The experience needed to go from the level to the next one.
+        """
+
+    def total(self, level: int):
+        """
+        :param level: A level.
+        :return: The experience needed to go from level 1 to the level.
+        """
+        return sum(self.required(previous) for previous in range(1, level))
+
+
+class LinearCurve(ExperienceCurve):
+    """Level n needs n times the scale to reach level n + 1; levels for a total are found with an integer sqrt."""
+
+    def __init__(self, scale: int = 50):
+        self.scale = scale
+
+    def level(self, total: int) -> int:
+        # total >= scale * level * (level - 1) / 2  <=>  (2 * level - 1) ** 2 <= 8 * total / scale + 1
+        return (math.isqrt(8 * total // self.scale + 1) + 1) // 2 if total > 0 else 1
+
+    def required(self, level: int):
+        return level * self.scale
+
+    def total(self, level: int):
+        return self.scale * level * (level - 1) // 2
+
+
+class TableCurve(ExperienceCurve):
+    """
+    Per-level requirements read from a table; the last entry applies to every level past the end of the table.
+    Levels for a total are found by binary search over the running totals.
+    """
+
+    def __init__(self, requirements: list[int]):
+        """
+        :param requirements: The experience needed to leave level 1, level 2 and so on; at least one, all positive.
+        """
+        if not requirements or min(requirements) <= 0:
+            raise ValueError("An experience table needs at least one positive requirement per level")
+        self.requirements = list(requirements)
+        self._totals = [0]
+        for required in self.requirements:
+            self._totals.append(self._totals[-1] + required)
+
+    def level(self, total: int) -> int:
+        if total < self._totals[-1]:
+            return bisect.bisect_right(self._totals, total)
+        return len(self._totals) + (total - self._totals[-1]) // self.requirements[-1]
+
+    def required(self, level: int):
+        return self.requirements[min(level, len(self.requirements)) - 1]
+
+    def total(self, level: int):
+        if level <= len(self._totals):
+            return self._totals[level - 1]
+        return self._totals[-1] + (level - len(self._totals)) * self.requirements[-1]
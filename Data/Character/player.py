@@ -1,18 +1,24 @@
 from Data.Character.character import Character
+from Data.Character.experience_curve import ExperienceCurve, LinearCurve
 from Data.Item.inventory import Inventory
 from Data.Item.item_reference import ItemRef
 
 
 class Player(Character):
+    """
+    Publishes "stats" after the level, experience, ability points or ability scores change, with the names of the
+    abilities whose scores changed.
+    """
+    __slots__ = ("ability_points", "experience", "level")
     __ability_points_per_level = 2
+    __experience_curve = LinearCurve(50)
     __initial_ability_points = 5
     __max_ability_score = 10
     __min_ability_score = 0
-    __required_experience_scale = 50
 
     def __init__(self, name="New Player", strength=1.0, dexterity=1.0, intelligence=1.0,
                  will=1.0, wisdom=1.0, level=1, experience=0, ability_points=5,
-                 inventory=Inventory()):
+                 inventory: Inventory = None):
         super().__init__(name, strength, dexterity, intelligence, will, wisdom, inventory)
         self.ability_points = ability_points
         self.experience = experience
@@ -20,38 +26,44 @@ class Player(Character):
 
     def addExperience(self, experience):
         """
-        Increases the player's experience and levels up the player when the required experience is met.
+        Increases the player's experience and levels up the player when the required experience is met, as many
+        levels at once as the experience curve allows.
         :param experience: The amount of experience to increase by.
         """
-        self.experience += abs(experience)
-        while True:
-            required_experience = self.requiredExperience()
-            if self.experience < required_experience:
-                break
-            self.experience -= required_experience
-            self._levelUp()
+        if not experience:
+            return
+        level, self.experience = Player.__experience_curve.advance(self.level, self.experience + abs(experience))
+        self.ability_points += (level - self.level) * self.__ability_points_per_level
+        self.level = level
+        self._publish("stats", ())
 
     def copyAttributes(self, other):
         if not isinstance(other, Player):
             self.resetAttributes()
             return
         self.name = other.name
-        self.abilities = other.abilities
+        self.scores = list(other.scores)
+        self._derived = None
         self.level = other.level
         self.experience = other.experience
         self.ability_points = other.ability_points
-        self.inventory = other.inventory
+        self.inventory.copyAttributes(other.inventory)
+        self._publish("stats", Character.abilityNames())
 
     def requiredExperience(self):
         """
         Calculates the experience required to level up.
         :return: Required experience as a number.
         """
-        return self.level * self.__required_experience_scale
+        return Player.__experience_curve.required(self.level)
 
-    def _levelUp(self):
-        self.level += 1
-        self.ability_points += self.__ability_points_per_level
+    @staticmethod
+    def abilityPointsPerLevel():
+        return Player.__ability_points_per_level
+
+    @staticmethod
+    def experienceCurve() -> ExperienceCurve:
+        return Player.__experience_curve
 
     @staticmethod
     def maxAbilityScore():
@@ -69,12 +81,21 @@ class Player(Character):
         if self.ability_points - amount < 0:
             return
 
-        ability = self.abilities[ability_name.lower()]
-        new_score = ability.score + amount
+        ability_id = Character.abilityId(ability_name)
+        new_score = self.scores[ability_id] + amount
         if new_score < self.__min_ability_score or new_score > self.__max_ability_score:
             return
-        ability.score = new_score
+        self.setAbilityScore(ability_id, new_score)
         self.ability_points -= amount
+        self._publish("stats", (ability_id.name.lower(),))
 
     def resetAttributes(self):
         self.copyAttributes(Player())
+
+    @staticmethod
+    def setExperienceCurve(curve: ExperienceCurve):
+        """
+        Changes how much experience every player needs per level.
+        :param curve: A LinearCurve, a TableCurve or any ExperienceCurve subclass.
+        """
+        Player.__experience_curve = curve
@@ -0,0 +1,137 @@
+import numpy
+
+from Data.Character.character import AbilityId, Character
+from Data.Character.experience_curve import LinearCurve
+from Data.Character.player import Player
+from Data.Scene.requirement import Requirement
+
+
+class Population:
+    """
+    A crowd of characters stored as NumPy columns: one float64 row of scores per ability (indexed by AbilityId) and
+    int64 columns of level, experience and ability points. Batch operations use the same formulas as Character and
+    Player and give the same results, including their rounding. Populations have no inventories.
+    """
+    __round_digits = 2
+
+    def __init__(self, size: int):
+        self.abilityPoints = numpy.full(size, Player().ability_points, dtype=numpy.int64)
+        self.experience = numpy.zeros(size, dtype=numpy.int64)
+        self.level = numpy.ones(size, dtype=numpy.int64)
+        self.scores = numpy.ones((len(AbilityId), size), dtype=numpy.float64)
+
+    def addExperience(self, experience):
+        """
+        Grants experience and levels up every character whose experience reaches the requirement, as
+        Player.addExperience does one character at a time.
+        :param experience: The whole amount to grant, either one for everybody or one per character.
+        """
+        experience = numpy.abs(numpy.broadcast_to(numpy.asarray(experience, dtype=numpy.int64), self.level.shape))
+        self.experience += experience
+        gained = numpy.flatnonzero(experience)  # like Player, nobody levels up from a grant of nothing
+        curve = Player.experienceCurve()
+        if isinstance(curve, LinearCurve):
+            self._advanceLinear(curve.scale, gained)
+            return
+        for index in gained:
+            level, self.experience[index] = curve.advance(int(self.level[index]), int(self.experience[index]))
+            self.abilityPoints[index] += (level - self.level[index]) * Player.abilityPointsPerLevel()
+            self.level[index] = level
+
+    def _advanceLinear(self, scale: int, indexes: numpy.ndarray):
+        """LinearCurve.advance for many characters at once; the float sqrt is corrected to the exact integer one."""
+        old_level = self.level[indexes]
+        total = scale * old_level * (old_level - 1) // 2 + self.experience[indexes]
+        bound = 8 * total // scale + 1
+        root = numpy.floor(numpy.sqrt(bound)).astype(numpy.int64)
+        root -= root * root > bound
+        root += (root + 1) * (root + 1) <= bound
+        level = numpy.maximum(old_level, (root + 1) // 2)
+        self.abilityPoints[indexes] += (level - old_level) * Player.abilityPointsPerLevel()
+        self.experience[indexes] = total - scale * level * (level - 1) // 2
+        self.level[indexes] = level
+
+    def craftingBonus(self) -> numpy.ndarray:
+        return Population._round(self.scores[AbilityId.WILL] + self.scores[AbilityId.STRENGTH] / 2.0)
+
+    def dodgeBonus(self) -> numpy.ndarray:
+        return Population._round(self.scores[AbilityId.DEXTERITY] + self.scores[AbilityId.WISDOM])
+
+    def enchantingBonus(self) -> numpy.ndarray:
+        return Population._round(self.scores[AbilityId.WISDOM] + self.scores[AbilityId.INTELLIGENCE] / 2.0)
+
+    @staticmethod
+    def fromPlayers(players: list[Player]):
+        """
+        Copies the stats of players into a new population.
+        :param players: The players, in population order.
+        :return: The population.
+        """
+        population = Population(len(players))
+        for index, player in enumerate(players):
+            population.abilityPoints[index] = player.ability_points
+            population.experience[index] = player.experience
+            population.level[index] = player.level
+            population.scores[:, index] = player.scores
+        return population
+
+    def __len__(self):
+        return self.level.size
+
+    def meets(self, requirement) -> numpy.ndarray:
+        """
+        Checks an ability requirement for everybody at once.
+        :param requirement: A list of Ability minimums, or a Requirement without items.
+        :return: A bool array, true where the character meets every minimum.
+        """
+        if isinstance(requirement, Requirement):
+            if requirement.items:
+                raise ValueError("Populations have no inventories to check item requirements against")
+            requirement = requirement.abilities or []
+        met = numpy.ones(len(self), dtype=bool)
+        for ability in requirement:
+            met &= self.scores[Character.abilityId(ability.name)] >= ability.score
+        return met
+
+    def player(self, index: int) -> Player:
+        """
+        Copies one character out of the population.
+        :param index: The character's index.
+        :return: A new player with the character's stats.
+        """
+        player = Player(level=int(self.level[index]), experience=int(self.experience[index]),
+                        ability_points=int(self.abilityPoints[index]))
+        for ability_id in AbilityId:
+            player.setAbilityScore(ability_id, float(self.scores[ability_id, index]))
+        return player
+
+    def powerLevel(self) -> numpy.ndarray:
+        scores = self.scores  # summed in the same order as Character.powerLevel
+        total = scores[AbilityId.INTELLIGENCE] + scores[AbilityId.DEXTERITY] + scores[AbilityId.STRENGTH] + scores[
+            AbilityId.WILL] + scores[AbilityId.WISDOM]
+        return numpy.floor(total).astype(numpy.int64)
+
+    def requiredExperience(self) -> numpy.ndarray:
+        curve = Player.experienceCurve()
+        if isinstance(curve, LinearCurve):
+            return self.level * curve.scale
+        return numpy.fromiter((curve.required(level) for level in self.level.tolist()), numpy.int64, len(self))
+
+    @staticmethod
+    def _round(values: numpy.ndarray) -> numpy.ndarray:
+        """
+        Rounds like the built-in round(value, 2). Scaling by 100 in binary can move a value across a rounding
+        boundary, so the few results that land close to one are recomputed with the built-in.
+        """
+        scale = 10.0 ** Population.__round_digits
+        scaled = values * scale
+        rounded = numpy.rint(scaled) / scale
+        distance = numpy.abs(scaled - numpy.floor(scaled) - 0.5)
+        near_ties = numpy.flatnonzero((distance < 1e-6 * numpy.maximum(1.0, numpy.abs(scaled))) | ~numpy.isfinite(
+            scaled))
+        for index in near_ties:
+            rounded[index] = round(float(values[index]), Population.__round_digits)
+        return rounded
+
+    def runBonus(self) -> numpy.ndarray:
+        return Population._round(self.scores[AbilityId.DEXTERITY] + self.scores[AbilityId.WILL])
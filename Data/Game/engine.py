@@ -0,0 +1,241 @@
+import json
+import os
+import time
+
+from Data.Character.player import Player
+from Data.Game.journal import SaveJournal
+from Data.Game.save_codec import SaveCodec
+from Data.Item.inventory import Inventory
+from Data.Scene.manager import SceneManager
+
+
+class Engine:
+    """
+    A single play session: the player, their progress through the scenes and their save files. Has no ui
+    dependencies, so any number of sessions can run headless within one process.
+
+    Once saved or loaded, every change is appended to the save's journal, and the save is rewritten as a new
+    snapshot only after enough changes have accumulated.
+
+    Saves are written in the compact binary format of SaveCodec unless json is asked for, which is slower and
+    larger but readable when debugging. Loading detects the format.
+    """
+    __compact_after = 200
+    __save_delimiter = "\n\n\n"
+    __json_args = {"indent": 4, "sort_keys": True}
+
+    def __init__(self, player: Player = None, scenes_path: str = None):
+        self.player: Player = player if player else Player(inventory=Inventory())
+        self.sceneManager = SceneManager(self.player, scenes_path)
+        self._binary = True
+        self._journal: SaveJournal = None
+        self._playStart = time.monotonic()
+        self._playTime = 0.0
+
+    def action(self, index: int) -> dict:
+        """
+        Describes an action of the current scene.
+        :param index: The action's index within the scene.
+        :return: A dict with the action's scene index, description and state, and the lowercase names of the
+        abilities and the ids of the items its requirement depends on.
+        """
+        manager = self.sceneManager
+        requirement = manager.current().getAction(index).requirement
+        predicate = requirement.predicate() if requirement else None
+        return {"index": index, "description": manager.actionDescription(index),
+                "enabled": manager.actionEnabled(index), "selected": manager.actionSelected(index),
+                "available": manager.actionAvailable(index), "removed": manager.actionRemoved(index),
+                "abilities": sorted(predicate.abilities) if predicate else [],
+                "items": sorted(predicate.items) if predicate else []}
+
+    def actions(self) -> list[dict]:
+        """
+        Lists the actions of the current scene that have not been removed.
+        :return: One dict per action with its scene index, description and state.
+        """
+        scene = self.sceneManager.current()
+        if not scene:
+            return []
+        manager = self.sceneManager
+        return [self.action(index) for index in range(len(scene.actions)) if not manager.actionRemoved(index)]
+
+    def adjacentImages(self) -> list[str]:
+        """
+        Lists the images of the scenes the current scene's actions lead to, which are likely to be shown next.
+        :return: The image paths, without duplicates.
+        """
+        images = []
+        for scene in self.sceneManager.adjacent():
+            if scene.imagePath and scene.imagePath not in images:
+                images.append(scene.imagePath)
+        return images
+
+    def describe(self) -> dict:
+        """
+        Describes the current scene.
+        :return: A dict with the scene name, description text and image path.
+        """
+        scene = self.sceneManager.current()
+        return {"name": scene.name if scene else "", "description": self.sceneManager.areaDescription(),
+                "image": scene.imagePath if scene else ""}
+
+    def detach(self):
+        """Stops journaling to the current save."""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def load(self, path: str):
+        """
+        Restores the player and scene progress from a save file in either format, and journals later changes to it.
+        :param path: The save file.
+        """
+        journal = SaveJournal(path, self.read(path))
+        journal.open()
+        self._journal = journal
+
+    def playTime(self) -> float:
+        """The total play time in seconds, including this session."""
+        return self._playTime + time.monotonic() - self._playStart
+
+    def read(self, path: str) -> int:
+        """
+        Restores the player and scene progress from a save file and its journal, without journaling later changes.
+        :param path: The save file.
+        :return: The journal generation of the save.
+        """
+        self.detach()
+        with open(path, 'rb') as save_file:
+            data = save_file.read()
+        self._binary = SaveCodec.detect(data)
+        if self._binary:
+            generation, self._playTime = SaveCodec.decode(data, self.player, self.sceneManager)
+        else:
+            import jsons  # json saves are only for debugging, so jsons is not imported until one is read or written
+            save_data = data.decode("utf-8").split(Engine.__save_delimiter)
+            player = jsons.loads(save_data[0], strip_privates=True, strip_properties=True)
+            for name, ability in json.loads(save_data[0]).get("abilities", {}).items():  # saves from before scores
+                player.setAbilityScore(Player.abilityId(name), ability["score"])
+            self.player.copyAttributes(player)
+            self.sceneManager.copyAttributes(jsons.loads(save_data[1], dict))
+            footer = json.loads(save_data[2]) if len(save_data) > 2 else {}
+            generation = footer.get("generation", 0)
+            self._playTime = footer.get("playTime", 0.0)
+        self._playStart = time.monotonic()
+
+        for record in SaveJournal(path, generation).records() or []:
+            if not self._replay(record):
+                break
+        return generation
+
+    def modifyAbility(self, ability_name: str, amount: int, allow_decrement=False):
+        """
+        Spends ability points on an ability score.
+        :param ability_name: The name of the ability to modify.
+        :param amount: The amount to modify by.
+        :param allow_decrement: When true, allows the player to correct their mistakes.
+        """
+        ability_points = self.player.ability_points
+        self.player.modifyAbilityScore(ability_name, amount, allow_decrement)
+        if self.player.ability_points != ability_points:
+            self._record("a", ability_name, amount, allow_decrement)
+
+    def newGame(self):
+        """Resets the player for character creation and returns to the first scene."""
+        self.detach()
+        self.player.resetAttributes()
+        self.sceneManager.copyAttributes(None)
+        self._playStart = time.monotonic()
+        self._playTime = 0.0
+
+    def _record(self, *record):
+        """
+        Journals a change, compacting the journal into a new snapshot once it grows long enough.
+        :param record: The record fields.
+        """
+        if self._journal is None:
+            return
+        self._journal.append(*record)
+        if len(self._journal) >= Engine.__compact_after:
+            self.save(self._journal.savePath, self._binary)
+
+    def _replay(self, record: list) -> bool:
+        """
+        Applies a journaled change.
+        :param record: The record fields.
+        :return: False if the record does not apply to the current state.
+        """
+        if record[0] == "s":
+            if record[1] != self.sceneManager.currentAreaIndex:
+                return False
+            self.sceneManager.selectAction(record[2])
+        elif record[0] == "a":
+            self.player.modifyAbilityScore(*record[1:])
+        else:
+            return False
+        return True
+
+    def save(self, path: str, binary: bool = True):
+        """
+        Writes a snapshot of the player and scene progress to a save file, and journals later changes next to it.
+        :param path: The save file.
+        :param binary: When false, writes the save as json instead.
+        """
+        # the new snapshot's generation must differ from the journal left next to the file, or its stale records
+        # would be replayed onto the snapshot
+        generation = SaveJournal.generationOf(path) + 1
+        if self._journal is not None and self._journal.savePath == path:
+            generation = max(generation, self._journal.generation + 1)
+        if binary:
+            save_data = SaveCodec.encode(self.player, self.sceneManager, generation, self.playTime())
+        else:
+            save_data = self._saveJson(generation).encode("utf-8")
+        self._binary = binary
+
+        temp_path = "{}.tmp".format(path)
+        with open(temp_path, 'wb') as save_file:
+            save_file.write(save_data)
+            save_file.flush()
+            os.fsync(save_file.fileno())
+        os.replace(temp_path, path)
+
+        if self._journal is None or self._journal.savePath != path:
+            self.detach()
+            self._journal = SaveJournal(path)
+        self._journal.reset(generation)
+
+    def savePath(self) -> str:
+        """The save file changes are journaled to, or None before saving or loading."""
+        return self._journal.savePath if self._journal is not None else None
+
+    def _saveJson(self, generation: int) -> str:
+        import jsons
+        save_data = jsons.dumps(self.player, jdkwargs=Engine.__json_args, strip_privates=True, strip_properties=True,
+                                verbose=jsons.Verbosity.WITH_CLASS_INFO)
+        save_data += Engine.__save_delimiter
+        save_data += jsons.dumps(self.sceneManager, jdkwargs=Engine.__json_args, strip_privates=True,
+                                 strip_properties=True, verbose=jsons.Verbosity.WITH_CLASS_INFO)
+        save_data += Engine.__save_delimiter
+        save_data += json.dumps({"generation": generation, "playTime": self.playTime()})
+        return save_data
+
+    def select(self, index: int) -> bool:
+        """
+        Selects an action of the current scene.
+        :param index: The action's index within the scene.
+        :return: True if the current scene changed.
+        """
+        scene_index = self.sceneManager.currentAreaIndex
+        if self.sceneManager.selectAction(index):
+            self._record("s", scene_index, index)
+        return self.sceneManager.currentAreaIndex != scene_index
+
+    def stats(self) -> dict:
+        """
+        Summarizes the player.
+        :return: A dict with the player's name, level, experience, ability points and ability scores.
+        """
+        player = self.player
+        return {"name": player.name, "level": player.level, "experience": player.experience,
+                "requiredExperience": player.requiredExperience(), "abilityPoints": player.ability_points,
+                "abilities": dict(zip(Player.abilityNames(), player.scores))}
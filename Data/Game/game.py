@@ -1,96 +1,198 @@
+import logging
 import os
 import sys
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
 
-import jsons
-
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
 from PyQt5.QtWidgets import QApplication
 
-from Data.Scene.manager import SceneManager
-from Data.Character.player import Player
-from Data.Item.item_database import ItemDatabase
+from Data.Game.journal import SaveJournal
 from Data.UI.manager import UiManager
 
 
+class _Loading(QObject):
+    progress = pyqtSignal(str, int, int)  # what is loading, amount done, total or 0 if unknown
+    finished = pyqtSignal()
+
+
 class Game:
-    __save_delimiter = "\n\n\n"
-    __json_args = {"indent": 4, "sort_keys": True}
+    """
+    Shows the main menu first and only then loads the items, the world and the session, on a worker thread while
+    the menu shows its progress. The session is published to the windows all at once, on the gui thread, when the
+    load is done. A menu choice made before then is carried out once it is, so the menu never stops responding.
+    """
 
     def __init__(self):
-        self._player: Player = Player()
-        self._sceneManager = SceneManager(self._player)
+        self._binarySaves = True  # set to False to write readable json saves when debugging
         self._directory = 'Saves'
-        self._fileExtension = "json"
-
-        self._app = QApplication(sys.argv)
+        self._fileExtensions = ("sav", "json")
+
+        self._app: QApplication = None
+        self._engine = None
+        self._index = None
+        self._loading: Future = None
+        self._loadingSignals: _Loading = None
+        self._pending = None  # what the player chose while the load was running
+        self._player = None
+        self._ui: UiManager = None
+
+    def run(self) -> int:
+        """
+        Shows the main menu and runs the ui until the last window closes.
+        :return: The application's exit code.
+        """
+        self._app = QApplication.instance() or QApplication(sys.argv)
         self._ui = UiManager()
-        self._ui.gameMenu().connect(get_area=self._sceneManager.current, get_area_description=self._sceneManager.areaDescription,
-                                    player=self._player, save_game=self.saveGame, select_action=self.selectAction)
-        self._ui.loadMenu().connect(delete_save=self.deleteSave, load_save=self.loadGame, load_info=self.loadInfo)
-        self._ui.mainMenu().connect(goto_new=self.newGame)
-        self._ui.newGameMenu().connect(player=self._player, start_game=self.startGame)
+        self._ui.connect("load", count_saves=self.countSaves, delete_save=self.deleteSave, load_save=self.loadGame,
+                         load_info=self.loadInfo)
+        self._ui.connect("main", goto_load=self.showLoad, goto_new=self.newGame)
         self._ui.show("main")
-
+        self._loadingSignals = _Loading()
+        self._loadingSignals.progress.connect(self._ui.mainMenu().showProgress)
+        self._loadingSignals.finished.connect(self._loaded)
+        QTimer.singleShot(0, self._startLoading)  # once the menu has been painted
+        return self._app.exec()
+
+    def _startLoading(self):
+        if self._loading is None:
+            progress = self._loadingSignals.progress.emit if self._loadingSignals else None
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="load")
+            self._loading = executor.submit(Game._load, self._directory, self._fileExtensions, progress)
+            executor.shutdown(wait=False)  # the worker exits once the load is done
+            if self._loadingSignals:
+                self._loading.add_done_callback(lambda loading: self._loadingSignals.finished.emit())
+
+    @staticmethod
+    def _load(directory: str, file_extensions: tuple, progress=None):
+        """
+        Loads the items, the world and a session in it, on the worker thread.
+        :param directory: The save directory.
+        :param file_extensions: The save file extensions.
+        :param progress: Called with what is loading, the amount done and the total, or 0 if it is not known.
+        :return: The session's Engine and the SaveIndex of the save directory.
+        """
+        from Data.Game.engine import Engine
+        from Data.Game.save_index import SaveIndex
+        from Data.Item.item_database import ItemDatabase
+        from Data.Scene.manager import SceneManager
+
+        progress = progress or (lambda message, done, total: None)
+        progress("Loading items", 0, 0)
         ItemDatabase.initialize()
-
-        sys.exit(self._app.exec())
-
-    def deleteSave(self, save_index: int):
-        filepath = self._saveFilepath(save_index)
+        progress("Loading the world", 0, 0)
+        SceneManager.world(SceneManager.defaultPath(), partial(progress, "Compiling the world"))
+        return Engine(), SaveIndex(directory, file_extensions)
+
+    def _loaded(self):
+        try:
+            self._session()
+        except Exception as error:  # a slot must not raise; the menu stays usable and shows what went wrong
+            logging.getLogger(__name__).exception("The game could not be loaded")
+            self._pending = None
+            self._ui.mainMenu().showMessage("The game could not be loaded: {}".format(error))
+            return
+        self._ui.mainMenu().hideProgress()
+        pending, self._pending = self._pending, None
+        if pending:
+            pending()
+
+    def _whenLoaded(self, action):
+        """
+        Carries out a menu choice now if the session is loaded, or else once it is.
+        :param action: Called without arguments on the gui thread.
+        """
+        self._startLoading()
+        self._pending = action
+        if self._loading.done():
+            self._loaded()
+
+    def _session(self):
+        """Waits for the load if it is still running, and connects the windows that need the session once it is."""
+        if self._engine is None:
+            self._startLoading()
+            engine, index = self._loading.result()
+            self._engine, self._index, self._player = engine, index, engine.player
+            self._ui.connect("game", adjacent_images=self._engine.adjacentImages, describe=self._engine.describe,
+                             get_action=self._engine.action, get_actions=self._engine.actions,
+                             modify_ability=self._engine.modifyAbility, player=self._player,
+                             save_game=self.saveGame, scene_manager=self._engine.sceneManager,
+                             select_action=self.selectAction)
+            self._ui.connect("new", player=self._player, start_game=self.startGame)
+        return self._engine
+
+    def countSaves(self) -> int:
+        """
+        Brings the save index up to date with the save directory, once each time the load menu is shown.
+        :return: The number of saves.
+        """
+        save_path = self._session().savePath()
+        if save_path and os.path.exists(save_path):
+            self._index.update(save_path, self._engine)  # journaled changes since the last snapshot
+        self._index.check()
+        return self._index.count()
+
+    def deleteSave(self, save_id: int):
+        self._session()
+        filepath = self._index.path(save_id)
         if not filepath:
             return
-        os.remove(filepath)
-
-    def loadGame(self, save_index: int):
-        save_filepath = self._saveFilepath(save_index)
+        if self._engine.savePath() and os.path.abspath(self._engine.savePath()) == os.path.abspath(filepath):
+            self._engine.detach()  # the game in progress stays unsaved instead of journaling to a deleted file
+        if os.path.exists(filepath):
+            os.remove(filepath)
+        SaveJournal.delete(filepath)
+        self._index.remove(save_id)
+
+    def loadGame(self, save_id: int):
+        self._session()
+        save_filepath = self._index.path(save_id)
         if not save_filepath:
             return
 
-        with open(save_filepath, 'r') as save_file:
-            save_data = save_file.read().split(Game.__save_delimiter)
-            self._player.copyAttributes(jsons.loads(save_data[0], strip_privates=True, strip_properties=True))
-            self._sceneManager.copyAttributes(jsons.loads(save_data[1], strip_privates=True, strip_properties=True))
+        self._engine.load(save_filepath)
         self._ui.show("game")
 
-    def loadInfo(self):
-        info = None
-        files = os.listdir(self._directory)
-        if files:
-            info: list[str] = []
-            for filename in files:
-                filepath = "{}/{}".format(self._directory, filename)
-                mod_time = time.strftime('%I:%M%p %m/%d/%Y', time.localtime(os.path.getmtime(filepath)))
-                info.append("{}\n{}".format(filename, mod_time))
-        return info
+    def loadInfo(self, offset: int, limit: int):
+        """
+        Lists a page of saves for the load menu, as indexed by the last countSaves.
+        :param offset: The number of saves to skip.
+        :param limit: The maximum number of saves to return.
+        :return: (save id, description) pairs for the page.
+        """
+        return [(info.id, self._saveDescription(info)) for info in self._index.page(offset, limit)]
 
     def newGame(self):
-        self._player.resetAttributes()
+        self._whenLoaded(self._newGame)
+
+    def _newGame(self):
+        self._engine.newGame()
         self._ui.show("new")
 
-    def _saveFilepath(self, file_index: int):
-        files = os.listdir(self._directory)
-        if not files or file_index >= len(files):
-            return None
-        filename = files[file_index]
-        return "{}/{}".format(self._directory, filename)
+    @staticmethod
+    def _saveDescription(info) -> str:
+        minutes = int(info.playTime or 0) // 60
+        mod_time = time.strftime('%I:%M%p %m/%d/%Y', time.localtime(info.mtime))
+        return "{} - Level {}\n{}\nPlayed {}:{:02d} - {}".format(info.name, info.level, info.scene, minutes // 60,
+                                                                 minutes % 60, mod_time)
 
     def saveGame(self):
         if not self._player:
             return
 
-        save_filepath = "{}/{}.{}".format(self._directory, self._player.name, self._fileExtension)
-        save_data = jsons.dumps(self._player, jdkwargs=Game.__json_args, strip_privates=True, strip_properties=True,
-                                verbose=jsons.Verbosity.WITH_CLASS_INFO)
-        save_data += Game.__save_delimiter
-        save_data += jsons.dumps(self._sceneManager, jdkwargs=Game.__json_args, strip_privates=True, strip_properties=True,
-                                 verbose=jsons.Verbosity.WITH_CLASS_INFO)
-        with open(save_filepath, 'w') as save_file:
-            save_file.write(save_data)
+        os.makedirs(self._directory, exist_ok=True)
+        extension = self._fileExtensions[0 if self._binarySaves else 1]
+        save_filepath = "{}/{}.{}".format(self._directory, self._player.name, extension)
+        self._engine.save(save_filepath, self._binarySaves)
+        self._index.update(save_filepath, self._engine)
+
+    def showLoad(self):
+        self._whenLoaded(partial(self._ui.show, "load"))
 
     def selectAction(self, index: int):
-        nextMenu = self._sceneManager.selectAction(index)
-        if nextMenu:
-            self._ui.show(nextMenu)
+        self._engine.select(index)
 
     def startGame(self):
+        self.saveGame()  # every later change is journaled to this save
         self._ui.show("game")
@@ -0,0 +1,126 @@
+import json
+import os
+
+
+class SaveJournal:
+    """
+    Append-only journal of the changes made to a save since its last snapshot, kept next to the save file with
+    one compact json record per line. The first line names the snapshot generation the records apply to, so a
+    journal left behind by an interrupted compaction is never replayed onto a newer snapshot.
+    """
+    __extension = ".journal"
+
+    def __init__(self, save_path: str, generation: int = 0):
+        self.generation = generation
+        self.path = SaveJournal.journalPath(save_path)
+        self.savePath = save_path
+        self._file = None
+        self._records = 0
+
+    def append(self, *record):
+        """
+        Appends a record and flushes it to disk.
+        :param record: The record fields, which must be json serializable.
+        """
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._records += 1
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    @staticmethod
+    def delete(save_path: str):
+        path = SaveJournal.journalPath(save_path)
+        if os.path.exists(path):
+            os.remove(path)
+
+    @staticmethod
+    def generationOf(save_path: str) -> int:
+        """
+        Reads the snapshot generation a save's journal was written for.
+        :param save_path: The save file.
+        :return: The generation, or 0 if there is no readable journal.
+        """
+        try:
+            with open(SaveJournal.journalPath(save_path), 'r') as journal_file:
+                header = json.loads(journal_file.readline())
+        except (OSError, ValueError):
+            return 0
+        return header.get("generation", 0) if isinstance(header, dict) else 0
+
+    @staticmethod
+    def journalPath(save_path: str):
+        return save_path + SaveJournal.__extension
+
+    def __len__(self):
+        return self._records
+
+    def open(self):
+        """
+        Opens the journal for appending, continuing after the existing records of this generation. A last record
+        torn by a crash is cut off first, so new records start on a line of their own.
+        """
+        journal = self._read()
+        if journal is None:
+            self.reset(self.generation)
+            return
+        records, end = journal
+        with open(self.path, 'r+b') as journal_file:
+            journal_file.truncate(end)
+        self._file = open(self.path, 'a')
+        self._records = len(records)
+
+    def _read(self):
+        """
+        Reads the journal.
+        :return: The records of this generation and the byte offset where the last complete record ends, or None
+        if the journal is missing or from another generation. Raises ValueError if a record before the last line
+        is corrupt.
+        """
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, 'rb') as journal_file:
+            lines = journal_file.read().split(b"\n")
+        try:
+            header = json.loads(lines[0])
+        except ValueError:
+            return None
+        if len(lines) < 2 or not isinstance(header, dict) or header.get("generation") != self.generation:
+            return None
+        records = []
+        end = len(lines[0]) + 1
+        for number, line in enumerate(lines[1:-1], 2):  # every line but the text after the last newline
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                if number < len(lines) - 1:
+                    raise ValueError("'{}' is corrupt at line {}".format(self.path, number))
+                break  # only the last record can be torn by a crash
+            end += len(line) + 1
+        return records, end
+
+    def records(self) -> list:
+        """
+        Reads the journal, leaving out a last record torn by a crash.
+        :return: The records of this generation, or None if the journal is missing or from another generation.
+        Raises ValueError if a record before the last line is corrupt.
+        """
+        journal = self._read()
+        return journal[0] if journal else None
+
+    def reset(self, generation: int):
+        """
+        Empties the journal after a new snapshot has been written.
+        :param generation: The generation of the new snapshot.
+        """
+        self.close()
+        self.generation = generation
+        self._file = open(self.path, 'w')
+        self._file.write(json.dumps({"generation": generation}) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._records = 0
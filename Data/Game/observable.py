@@ -0,0 +1,32 @@
+class Observable:
+    """
+    Mixin that publishes named change events to subscribed callbacks, so views can update only what changed.
+    Subscribers are private state and are never saved. Slotted subclasses must declare an "_observers" slot.
+    """
+    __slots__ = ()
+
+    def _publish(self, event: str, *args):
+        """
+        Calls the callbacks subscribed to an event.
+        :param event: The event name.
+        :param args: The arguments passed to each callback.
+        """
+        observers = getattr(self, "_observers", None)
+        if observers and event in observers:
+            for callback in list(observers[event]):
+                callback(*args)
+
+    def subscribe(self, event: str, callback):
+        """
+        Calls a callback whenever an event is published.
+        :param event: The event name.
+        :param callback: The callback, which receives the event's arguments.
+        """
+        if getattr(self, "_observers", None) is None:
+            self._observers: dict[str, list] = {}
+        self._observers.setdefault(event, []).append(callback)
+
+    def unsubscribe(self, event: str, callback):
+        observers = getattr(self, "_observers", None)
+        if observers and callback in observers.get(event, []):
+            observers[event].remove(callback)
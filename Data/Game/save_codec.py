@@ -0,0 +1,170 @@
+import struct
+
+from Data.Character.player import Player
+from Data.Item.inventory import Inventory
+from Data.Item.item_reference import ItemRef
+from Data.Scene.manager import SceneManager
+
+
+class SaveCodec:
+    """
+    Compact binary save format, written field by field without reflection. All numbers are little-endian; strings
+    are a u16 byte length followed by utf-8. Version 2 added the play time after the header. Layout after that:
+    player (name, level, experience, ability points), abilities (count, then name and score each),
+    inventory (capacity, currency, stack count, then id and quantity pairs),
+    scene progress (current index, history, then each touched scene's selection bitset).
+    """
+    __magic = b"TRPS"
+    __version = 2
+    __header = struct.Struct("<4sHI")  # magic, version, journal generation
+    __play_time = struct.Struct("<d")  # seconds, since version 2
+    __ability = struct.Struct("<d")
+    __bitset = struct.Struct("<iH")  # scene index, bitset byte length
+    __count = struct.Struct("<I")
+    __inventory = struct.Struct("<IqI")  # capacity, currency, stack count
+    __player = struct.Struct("<Iqi")  # level, experience, ability points
+    __scene = struct.Struct("<iI")  # current index, history length
+
+    @staticmethod
+    def decode(data: bytes, player: Player, scene_manager: SceneManager) -> tuple[int, float]:
+        """
+        Restores a player and their scene progress from a binary save of this or an earlier version.
+        :param data: The save file contents.
+        :param player: The player to restore into.
+        :param scene_manager: The scene manager to restore into.
+        :return: The journal generation and play time of the save.
+        """
+        magic, version, generation = SaveCodec.__header.unpack_from(data, 0)
+        if magic != SaveCodec.__magic or not 1 <= version <= SaveCodec.__version:
+            raise ValueError("Not a version 1 to {} binary save".format(SaveCodec.__version))
+        offset = SaveCodec.__header.size
+        play_time = 0.0
+        if version >= 2:
+            play_time, = SaveCodec.__play_time.unpack_from(data, offset)
+            offset += SaveCodec.__play_time.size
+        saved = Player()
+        offset = SaveCodec._decodePlayer(data, offset, saved)
+        saved.inventory, offset = SaveCodec._decodeInventory(data, offset)
+        SaveCodec._decodeProgress(data, offset, scene_manager)
+        player.copyAttributes(saved)
+        return generation, play_time
+
+    @staticmethod
+    def detect(data: bytes) -> bool:
+        """
+        Determines whether save file contents are in the binary format.
+        :param data: At least the first four bytes of the save file.
+        :return: True if the contents start with the binary save magic.
+        """
+        return data[:len(SaveCodec.__magic)] == SaveCodec.__magic
+
+    @staticmethod
+    def encode(player: Player, scene_manager: SceneManager, generation: int = 0, play_time: float = 0.0) -> bytes:
+        """
+        Writes a player and their scene progress as a binary save.
+        :param player: The player.
+        :param scene_manager: The player's scene manager.
+        :param generation: The journal generation of the save.
+        :param play_time: The total play time in seconds.
+        :return: The save file contents.
+        """
+        buffer = bytearray(SaveCodec.__header.pack(SaveCodec.__magic, SaveCodec.__version, generation))
+        buffer += SaveCodec.__play_time.pack(play_time)
+        SaveCodec._encodePlayer(buffer, player)
+        SaveCodec._encodeInventory(buffer, player.inventory)
+        SaveCodec._encodeProgress(buffer, scene_manager)
+        return bytes(buffer)
+
+    # Players and abilities
+
+    @staticmethod
+    def _decodePlayer(data: bytes, offset: int, player: Player) -> int:
+        player.name, offset = SaveCodec._decodeString(data, offset)
+        player.level, player.experience, player.ability_points = SaveCodec.__player.unpack_from(data, offset)
+        offset += SaveCodec.__player.size
+        count, = SaveCodec.__count.unpack_from(data, offset)
+        offset += SaveCodec.__count.size
+        for _ in range(count):
+            name, offset = SaveCodec._decodeString(data, offset)
+            score, = SaveCodec.__ability.unpack_from(data, offset)
+            offset += SaveCodec.__ability.size
+            try:
+                player.setAbilityScore(Player.abilityId(name), score)
+            except KeyError:  # an ability this version does not have
+                pass
+        return offset
+
+    @staticmethod
+    def _encodePlayer(buffer: bytearray, player: Player):
+        SaveCodec._encodeString(buffer, player.name)
+        buffer += SaveCodec.__player.pack(player.level, player.experience, player.ability_points)
+        buffer += SaveCodec.__count.pack(len(player.scores))
+        for name, score in zip(Player.abilityNames(), player.scores):
+            SaveCodec._encodeString(buffer, name)
+            buffer += SaveCodec.__ability.pack(score)
+
+    # Inventories and item refs
+
+    @staticmethod
+    def _decodeInventory(data: bytes, offset: int):
+        capacity, currency, count = SaveCodec.__inventory.unpack_from(data, offset)
+        offset += SaveCodec.__inventory.size
+        pairs = struct.unpack_from("<{}i".format(count * 2), data, offset)
+        offset += count * 8
+        item_references = [ItemRef(pairs[index], pairs[index + 1]) for index in range(0, len(pairs), 2)]
+        return Inventory(capacity, currency, item_references), offset
+
+    @staticmethod
+    def _encodeInventory(buffer: bytearray, inventory: Inventory):
+        buffer += SaveCodec.__inventory.pack(inventory.capacity(), inventory.currency, len(inventory))
+        pairs = []
+        for item_reference in inventory.itemRefs:
+            pairs.append(item_reference.id)
+            pairs.append(item_reference.quantity)
+        buffer += struct.pack("<{}i".format(len(pairs)), *pairs)
+
+    # Scene progress
+
+    @staticmethod
+    def _decodeProgress(data: bytes, offset: int, scene_manager: SceneManager) -> int:
+        current, history = SaveCodec.__scene.unpack_from(data, offset)
+        offset += SaveCodec.__scene.size
+        previous = list(struct.unpack_from("<{}i".format(history), data, offset))
+        offset += history * 4
+        count, = SaveCodec.__count.unpack_from(data, offset)
+        offset += SaveCodec.__count.size
+        selected = {}
+        for _ in range(count):
+            scene_index, length = SaveCodec.__bitset.unpack_from(data, offset)
+            offset += SaveCodec.__bitset.size
+            selected[scene_index] = int.from_bytes(data[offset:offset + length], "little")
+            offset += length
+        scene_manager.copyAttributes({"currentAreaIndex": current, "previousAreaIndexes": previous,
+                                      "progress": {"selected": selected}})
+        return offset
+
+    @staticmethod
+    def _encodeProgress(buffer: bytearray, scene_manager: SceneManager):
+        previous = scene_manager.previousAreaIndexes
+        buffer += SaveCodec.__scene.pack(scene_manager.currentAreaIndex, len(previous))
+        buffer += struct.pack("<{}i".format(len(previous)), *previous)
+        selected = scene_manager.progress.selected
+        buffer += SaveCodec.__count.pack(len(selected))
+        for scene_index, bits in selected.items():
+            length = (bits.bit_length() + 7) // 8
+            buffer += SaveCodec.__bitset.pack(scene_index, length)
+            buffer += bits.to_bytes(length, "little")
+
+    # Strings
+
+    @staticmethod
+    def _decodeString(data: bytes, offset: int):
+        length, = struct.unpack_from("<H", data, offset)
+        offset += 2
+        return str(data[offset:offset + length], "utf-8"), offset + length
+
+    @staticmethod
+    def _encodeString(buffer: bytearray, text: str):
+        encoded = text.encode("utf-8")
+        buffer += struct.pack("<H", len(encoded))
+        buffer += encoded
@@ -0,0 +1,155 @@
+import os
+import sqlite3
+import struct
+
+from Data.Game.engine import Engine
+
+
+class SaveInfo:
+    """
+    What the load menu shows about a save, without loading it.
+    """
+
+    def __init__(self, save_id: int, filename: str, name: str, level: int, play_time: float, scene: str,
+                 mtime: float):
+        self.id = save_id
+        self.filename = filename
+        self.level = level
+        self.mtime = mtime
+        self.name = name
+        self.playTime = play_time
+        self.scene = scene
+
+
+class SaveIndex:
+    """
+    Sidecar sqlite database of save metadata, kept in the save directory. Rows are updated as saves are written and
+    deleted, so listing saves costs one query instead of touching every file. Files added, changed or removed behind
+    the index's back are picked up by check(), which rescans only when the directory's mtime has moved, and then
+    reads only the files whose mtime differs from their row.
+    """
+    __filename = "index.db"
+    __schema = 1
+
+    def __init__(self, directory: str, extensions: tuple[str, ...] = ("sav", "json"), scenes_path: str = None):
+        self.directory = directory
+        self._connection: sqlite3.Connection = None
+        self._extensions = tuple(".{}".format(extension) for extension in extensions)
+        self._scenesPath = scenes_path
+
+    def check(self):
+        """Brings the index up to date with the save directory if anything changed since it was last checked."""
+        connection = self._connect()
+        row = connection.execute("SELECT value FROM meta WHERE key = 'directory_mtime'").fetchone()
+        if row is None or row[0] != self._directoryStamp():
+            self._scan()
+
+    def close(self):
+        if self._connection:
+            self._connection.close()
+            self._connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(self.directory, exist_ok=True)
+            connection = sqlite3.connect(os.path.join(self.directory, SaveIndex.__filename))
+            # keeping the rollback journal file around stops index writes from moving the directory's mtime
+            connection.execute("PRAGMA journal_mode=PERSIST")
+            if connection.execute("PRAGMA user_version").fetchone()[0] != SaveIndex.__schema:
+                with connection:
+                    connection.execute("DROP TABLE IF EXISTS saves")
+                    connection.execute("DROP TABLE IF EXISTS meta")
+                    connection.execute("CREATE TABLE saves (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                                       "filename TEXT UNIQUE NOT NULL, name TEXT, level INTEGER, play_time REAL, "
+                                       "scene TEXT, mtime REAL)")
+                    connection.execute("CREATE INDEX saves_mtime ON saves (mtime DESC, id)")
+                    connection.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value)")
+                    connection.execute("PRAGMA user_version = {}".format(SaveIndex.__schema))
+            self._connection = connection
+        return self._connection
+
+    def count(self) -> int:
+        """The number of indexed saves."""
+        return self._connect().execute("SELECT COUNT(*) FROM saves").fetchone()[0]
+
+    def _directoryStamp(self) -> int:
+        return os.stat(self.directory).st_mtime_ns
+
+    def get(self, save_id: int) -> SaveInfo:
+        """
+        Looks up a save by id.
+        :param save_id: The save's id, which stays the same for as long as the file exists.
+        :return: The save's info, or None if it is not indexed.
+        """
+        row = self._connect().execute("SELECT * FROM saves WHERE id = ?", (save_id,)).fetchone()
+        return SaveInfo(*row) if row else None
+
+    def page(self, offset: int, limit: int) -> list[SaveInfo]:
+        """
+        Lists indexed saves, most recently written first.
+        :param offset: The number of saves to skip.
+        :param limit: The maximum number of saves to return.
+        :return: The saves on the page.
+        """
+        rows = self._connect().execute("SELECT * FROM saves ORDER BY mtime DESC, id LIMIT ? OFFSET ?",
+                                       (limit, offset))
+        return [SaveInfo(*row) for row in rows]
+
+    def path(self, save_id: int) -> str:
+        """
+        Finds a save's file.
+        :param save_id: The save's id.
+        :return: The path of the save file, or None if it is not indexed.
+        """
+        info = self.get(save_id)
+        return os.path.join(self.directory, info.filename) if info else None
+
+    def remove(self, save_id: int):
+        """
+        Removes a save from the index after its file has been deleted.
+        :param save_id: The save's id.
+        """
+        with self._connect() as connection:
+            connection.execute("DELETE FROM saves WHERE id = ?", (save_id,))
+
+    def _scan(self):
+        """Reconciles the index with the save files, reading only the saves that are new or changed."""
+        from jsons.exceptions import JsonsError  # json saves are rare, so jsons is not imported until a scan
+
+        connection = self._connect()
+        indexed = {filename: mtime for filename, mtime in connection.execute("SELECT filename, mtime FROM saves")}
+        reader = None
+        with connection:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(self._extensions) or not entry.is_file():
+                        continue
+                    mtime = entry.stat().st_mtime
+                    if indexed.pop(entry.name, None) == mtime:
+                        continue
+                    reader = reader or Engine(scenes_path=self._scenesPath)
+                    try:
+                        reader.read(entry.path)
+                    except (OSError, ValueError, KeyError, IndexError, struct.error, JsonsError):
+                        continue  # not a readable save; leave it out of the menu
+                    self._write(connection, entry.name, reader, mtime)
+            connection.executemany("DELETE FROM saves WHERE filename = ?", ((filename,) for filename in indexed))
+            connection.execute("INSERT OR REPLACE INTO meta VALUES ('directory_mtime', ?)", (self._directoryStamp(),))
+
+    def update(self, path: str, engine: Engine):
+        """
+        Records the current state of a session as the metadata of its save file.
+        :param path: The save file, within the save directory.
+        :param engine: The session that was saved to the file.
+        """
+        with self._connect() as connection:
+            self._write(connection, os.path.basename(path), engine, os.path.getmtime(path))
+
+    @staticmethod
+    def _write(connection: sqlite3.Connection, filename: str, engine: Engine, mtime: float):
+        connection.execute("INSERT INTO saves (filename, name, level, play_time, scene, mtime) "
+                           "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (filename) DO UPDATE SET name = excluded.name, "
+                           "level = excluded.level, play_time = excluded.play_time, scene = excluded.scene, "
+                           "mtime = excluded.mtime",
+                           (filename, engine.player.name, engine.player.level, engine.playTime(),
+                            engine.describe()["name"], mtime))
@@ -1,38 +1,85 @@
 import bisect
+import contextlib
 
+from Data.Game.observable import Observable
 from Data.Item.item_reference import ItemRef
 
 
-class Inventory:
-    __modified = None
+class InventoryChange:
+    """
+    A coalesced description of the modifications made to an inventory.
+    """
 
     def __init__(self):
+        self.items: set[int] = set()  # ids of the items whose quantity changed, including added and removed stacks
+        self.layout = False  # stacks were added or removed, so rows may have moved
+        self.rows: set[int] = set()  # rows whose quantity changed
+
+    def __bool__(self):
+        return self.layout or bool(self.rows)
+
+
+class InventoryFullError(OverflowError):
+    pass
+
+
+class Inventory(Observable):
+    """
+    Publishes "modified" with an InventoryChange after each mutation or completed transaction.
+    """
+
+    def __init__(self, capacity: int = 10, currency: int = 0, itemRefs: list[ItemRef] = None):
         super().__init__()
-        self.currency: int = 0
-        self.itemRefs: list[ItemRef] = []
+        self.currency: int = currency
+        self.itemRefs: list[ItemRef] = sorted(itemRefs) if itemRefs else []
+        self.stackCapacity: int = capacity
+        self._change: InventoryChange = None
+        self._slots: dict[int, ItemRef] = {item_reference.id: item_reference for item_reference in self.itemRefs}
+        self._sortKeys: list[int] = [item_reference.sortKey() for item_reference in self.itemRefs]
+        self._undo: list[tuple] = None
 
-    @staticmethod
-    def capacity():
-        """The maximum item capacity."""
-        return 10
+    def capacity(self):
+        """The maximum number of item stacks."""
+        return self.stackCapacity
 
     def clear(self):
         """Removes all items."""
-        self.itemRefs.clear()
-        self.__modified()
+        self.empty()
+
+    def copyAttributes(self, other):
+        """
+        Replaces the contents of this inventory with those of another, keeping this inventory's callback.
+        :param other: The inventory to copy.
+        """
+        if not isinstance(other, Inventory):
+            other = Inventory()
+        with self.transaction():
+            self._undo.append(("reset", self.itemRefs, self._slots, self._sortKeys, self.currency, self.stackCapacity))
+            self._change.items.update(self._slots, other._slots)
+            self.currency = other.currency
+            self.stackCapacity = other.stackCapacity
+            self.itemRefs = [ItemRef(item_reference.id, item_reference.quantity) for item_reference in other.itemRefs]
+            self._slots = {item_reference.id: item_reference for item_reference in self.itemRefs}
+            self._sortKeys = list(other._sortKeys)
+            self._change.layout = True
 
     def __contains__(self, item_reference: ItemRef):
         """Return key in self."""
-        return self.itemRefs.__contains__(item_reference)
+        return isinstance(item_reference, ItemRef) and item_reference.id in self._slots
 
     def empty(self) -> list[ItemRef]:
         """
         Removes all items.
         :return: A list containing the removed items.
         """
-        emptied_items = self.itemRefs
-        self.itemRefs = []
-        self.__modified()
+        with self.transaction():
+            emptied_items = self.itemRefs
+            self._undo.append(("reset", self.itemRefs, self._slots, self._sortKeys, self.currency, self.stackCapacity))
+            self._change.items.update(self._slots)
+            self.itemRefs = []
+            self._slots = {}
+            self._sortKeys = []
+            self._change.layout = True
         return emptied_items
 
     def full(self) -> bool:
@@ -40,7 +87,7 @@ class Inventory:
         Checks the size against the capacity.
         :return: True if size meets or exceeds the capacity.
         """
-        return len(self.itemRefs) >= Inventory.capacity()
+        return len(self.itemRefs) >= self.stackCapacity
 
     def get(self, index: int = None, item_id: int = None):
         """
@@ -53,34 +100,41 @@ class Inventory:
             if self.validIndex(index):
                 return self.itemRefs[index]
         elif item_id is not None:
-            for item in self.itemRefs:
-                if item.id == item_id:
-                    return item
+            return self._slots.get(item_id)
         return None
 
+    def quantity(self, item_id: int) -> int:
+        """
+        Counts an item.
+        :param item_id: The item id.
+        :return: The quantity held, or 0 if there is no stack of the item.
+        """
+        item_reference = self._slots.get(item_id)
+        return item_reference.quantity if item_reference else 0
+
     def __len__(self):
         return len(self.itemRefs)
 
-    def put(self, *item_references: ItemRef) -> list[ItemRef]:
+    def put(self, *item_references: ItemRef, strict: bool = False) -> list[ItemRef]:
         """
         Puts the given items into the inventory.
         :param item_references: The item refs to put.
+        :param strict: When true, nothing is put unless every item fits.
         :return: List of items that did not fit into the inventory.
         """
         rejected_items: list[ItemRef] = []
-        for item_reference in item_references:
-            try:  # try to increase quantity of existing item
-                index = self.itemRefs.index(item_reference)
-                existing_item = self.itemRefs[index]
-                existing_item.quantity = existing_item.quantity + item_reference.quantity
-                continue
-            except ValueError:
+        with self.transaction():
+            for item_reference in item_references:
+                existing_item = self._slots.get(item_reference.id)
+                if existing_item:  # increase quantity of existing item
+                    self._setQuantity(existing_item, existing_item.quantity + item_reference.quantity)
+                    continue
                 if self.full():
+                    if strict:
+                        raise InventoryFullError("No room for item '{}'".format(item_reference.id))
                     rejected_items.append(item_reference)
                     continue
-                bisect.insort(self.itemRefs, item_reference)
-                continue
-        self.__modified()
+                self._insert(ItemRef(item_reference.id, item_reference.quantity))
         return rejected_items
 
     def remove(self, index: int = None, item_reference: ItemRef = None, quantity: int = 0):
@@ -90,31 +144,64 @@ class Inventory:
         :param item_reference: The item reference.
         :param quantity: The quantity to remove.
         """
-        if index:
+        if index is not None:
             if not self.validIndex(index):
                 return
             item_reference = self.itemRefs[index]
-        elif item_reference and not self.__contains__(item_reference):
+        elif item_reference:
+            item_reference = self._slots.get(item_reference.id)
+        if not item_reference:
             return
-        item_reference.quantity -= abs(quantity)
-        if quantity == 0 or item_reference.quantity <= 0:
-            self.itemRefs.remove(item_reference)
-        self.__modified()
+        with self.transaction():
+            self._setQuantity(item_reference, item_reference.quantity - abs(quantity))
+            if quantity == 0 or item_reference.quantity <= 0:
+                self._pop(item_reference)
 
     def setOnModified(self, slot):
-        self.__modified = slot
+        """
+        Adds a callback invoked with an InventoryChange after each mutation or completed transaction.
+        :param slot: The callback.
+        """
+        self.subscribe("modified", slot)
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Groups mutations so they apply atomically and notify once. Any exception raised within the block rolls back
+        the mutations made inside it before propagating.
+        """
+        outermost = self._undo is None
+        if outermost:
+            self._undo = []
+            self._change = InventoryChange()
+        savepoint = len(self._undo)
+        committed = False
+        try:
+            yield self
+            committed = True
+        finally:
+            if not committed:
+                self._rollback(savepoint)
+            if outermost:
+                change = self._change
+                self._change = None
+                self._undo = None
+                if committed and change:
+                    self._publish("modified", change)
 
     def use(self, index: int = None, item_reference: ItemRef = None, quantity: int = 1):
-        if index:
+        if index is not None:
             if not self.validIndex(index):
                 return
             item_reference = self.get(index)
-        elif item_reference and not self.itemRefs.__contains__(item_reference):
+        elif item_reference:
+            item_reference = self._slots.get(item_reference.id)
+        if not item_reference:
             return
-        item_reference.quantity -= quantity
-        if item_reference.quantity <= 0:
-            self.remove(item_reference=item_reference)
-        self.__modified()
+        with self.transaction():
+            self._setQuantity(item_reference, item_reference.quantity - quantity)
+            if item_reference.quantity <= 0:
+                self._pop(item_reference)
 
     def validIndex(self, index: int):
         """
@@ -123,3 +210,53 @@ class Inventory:
         :return: True if the index is in bounds.
         """
         return abs(index) in range(len(self.itemRefs))
+
+    def _insert(self, item_reference: ItemRef):
+        """
+        Adds a new stack to the ordered list and the id index.
+        :param item_reference: The item reference to store.
+        """
+        sort_key = item_reference.sortKey()
+        index = bisect.bisect(self._sortKeys, sort_key)
+        self._sortKeys.insert(index, sort_key)
+        self.itemRefs.insert(index, item_reference)
+        self._slots[item_reference.id] = item_reference
+        self._undo.append(("insert", item_reference))
+        self._change.items.add(item_reference.id)
+        self._change.layout = True
+
+    def _pop(self, item_reference: ItemRef):
+        """
+        Drops a stack from the ordered list and the id index.
+        :param item_reference: The stored item reference.
+        """
+        index = bisect.bisect_left(self._sortKeys, item_reference.sortKey())
+        self.itemRefs.pop(index)
+        self._sortKeys.pop(index)
+        del self._slots[item_reference.id]
+        self._undo.append(("pop", item_reference))
+        self._change.items.add(item_reference.id)
+        self._change.layout = True
+
+    def _rollback(self, savepoint: int):
+        """
+        Reverts the mutations recorded after the savepoint, most recent first.
+        :param savepoint: The undo log length to roll back to.
+        """
+        undo, self._undo = self._undo, []
+        for entry in reversed(undo[savepoint:]):
+            if entry[0] == "quantity":
+                entry[1].quantity = entry[2]
+            elif entry[0] == "insert":
+                self._pop(entry[1])
+            elif entry[0] == "pop":
+                self._insert(entry[1])
+            else:
+                self.itemRefs, self._slots, self._sortKeys, self.currency, self.stackCapacity = entry[1:]
+        self._undo = undo[:savepoint]
+
+    def _setQuantity(self, item_reference: ItemRef, quantity: int):
+        self._undo.append(("quantity", item_reference, item_reference.quantity))
+        item_reference.quantity = quantity
+        self._change.items.add(item_reference.id)
+        self._change.rows.add(bisect.bisect_left(self._sortKeys, item_reference.sortKey()))
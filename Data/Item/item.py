@@ -1,4 +1,6 @@
 class Item:
+	__slots__ = ("name", "type")
+
 	def __init__(self, name: str, type: str):
 		self.name = name
 		self.type = type
@@ -0,0 +1,148 @@
+import mmap
+import os
+import struct
+import sys
+
+from Data.Item.item import Item
+
+
+class ItemView(Item):
+    """
+    Read-only view of a single record within a compiled item catalog.
+    """
+    __slots__ = ("_catalog", "_index")
+
+    def __init__(self, catalog, index: int):
+        self._catalog = catalog
+        self._index = index
+
+    @property
+    def name(self):
+        return self._catalog.name(self._index)
+
+    @property
+    def type(self):
+        return self._catalog.type(self._index)
+
+    def __repr__(self):
+        return "ItemView({}, {!r}, {!r})".format(self._index, self.name, self.type)
+
+
+class ItemCatalog:
+    """
+    Memory-mapped item catalog: a header, fixed-width records, then a utf-8 string table.
+    """
+    __magic = b"TRIC"
+    __version = 2
+    __header = struct.Struct("<4sHHII")  # magic, version, reserved, count, string table offset
+    __record = struct.Struct("<IIIII")  # name offset, name length, type offset, type length, name ordinal
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as catalog_file:
+            self._buffer = mmap.mmap(catalog_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, count, strings_offset = ItemCatalog.__header.unpack_from(self._buffer, 0)
+        if magic != ItemCatalog.__magic or version != ItemCatalog.__version:
+            self._buffer.close()
+            raise ValueError("'{}' is not a version {} item catalog".format(path, ItemCatalog.__version))
+        self._count = count
+        self._strings = strings_offset
+        self.path = path
+
+    def close(self):
+        self._buffer.close()
+
+    def get(self, index: int) -> ItemView:
+        """
+        Retrieves a read-only view of an item.
+        :param index: The item's catalog index.
+        :return: An instance of ItemView.
+        """
+        return ItemView(self, index)
+
+    def __len__(self):
+        return self._count
+
+    def name(self, index: int) -> str:
+        offset, length, _, _, _ = self._unpack(index)
+        return self._string(offset, length)
+
+    def type(self, index: int) -> str:
+        _, _, offset, length, _ = self._unpack(index)
+        return self._string(offset, length)
+
+    def ordinal(self, index: int) -> int:
+        """
+        Retrieves the item's position when the catalog is ordered by name.
+        :param index: The item's catalog index.
+        :return: The name ordinal, unique per item.
+        """
+        if index not in range(0, self._count):
+            raise IndexError("Index '{}' is not within the bounds of the catalog".format(index))
+        return self._unpack(index)[4]
+
+    def _string(self, offset: int, length: int) -> str:
+        start = self._strings + offset
+        return str(self._buffer[start:start + length], "utf-8")
+
+    def _unpack(self, index: int):
+        return ItemCatalog.__record.unpack_from(self._buffer,
+                                               ItemCatalog.__header.size + index * ItemCatalog.__record.size)
+
+    @staticmethod
+    def compile(items: list[Item], path: str):
+        """
+        Writes the given items to a catalog file.
+        :param items: The items, in database id order.
+        :param path: The catalog file to write.
+        """
+        strings = bytearray()
+        interned: dict[str, tuple[int, int]] = {}
+
+        def intern(text: str):
+            if text not in interned:
+                encoded = text.encode("utf-8")
+                interned[text] = (len(strings), len(encoded))
+                strings.extend(encoded)
+            return interned[text]
+
+        ordinals = [0] * len(items)
+        for ordinal, index in enumerate(sorted(range(len(items)), key=lambda i: (items[i].name, i))):
+            ordinals[index] = ordinal
+
+        records = bytearray()
+        for item, ordinal in zip(items, ordinals):
+            records.extend(ItemCatalog.__record.pack(*intern(item.name), *intern(item.type), ordinal))
+
+        strings_offset = ItemCatalog.__header.size + len(records)
+        temp_path = "{}.tmp".format(path)
+        with open(temp_path, 'wb') as catalog_file:
+            catalog_file.write(ItemCatalog.__header.pack(ItemCatalog.__magic, ItemCatalog.__version, 0, len(items),
+                                                         strings_offset))
+            catalog_file.write(records)
+            catalog_file.write(strings)
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def stale(source_path: str, catalog_path: str):
+        """
+        Determines whether the catalog needs to be compiled from its source.
+        :param source_path: The json item database.
+        :param catalog_path: The compiled catalog.
+        :return: True if the catalog is missing, from another version or older than the source.
+        """
+        if not os.path.exists(catalog_path):
+            return True
+        with open(catalog_path, 'rb') as catalog_file:
+            header = catalog_file.read(ItemCatalog.__header.size)
+        if len(header) < ItemCatalog.__header.size or ItemCatalog.__header.unpack(header)[:2] != (
+                ItemCatalog.__magic, ItemCatalog.__version):
+            return True
+        return os.path.exists(source_path) and os.path.getmtime(source_path) > os.path.getmtime(catalog_path)
+
+
+if __name__ == "__main__":
+    from Data.Item.item_database import ItemDatabase
+
+    source = sys.argv[1] if len(sys.argv) > 1 else ItemDatabase.sourcePath()
+    target = sys.argv[2] if len(sys.argv) > 2 else ItemDatabase.catalogPath()
+    ItemCatalog.compile(ItemDatabase.load(source), target)
@@ -1,30 +1,82 @@
-import copy
-
-import jsons
-
 from Data.Item.item import Item
+from Data.Item.item_catalog import ItemCatalog
 
 
 class ItemDatabase:
-    __db: list[Item] = []
+    __catalog: ItemCatalog = None
+    __catalog_path = "Data/items.catalog"
     __db_path = "Data/items.json"
 
     @staticmethod
-    def initialize():
-        with open(ItemDatabase.__db_path, 'r') as itemdb:
-            ItemDatabase.__db = jsons.loads(itemdb.read(), cls=list[Item])
+    def initialize(db_path: str = None, catalog_path: str = None):
+        """
+        Opens the compiled item catalog, compiling it first if the json database is newer.
+        :param db_path: The json item database.
+        :param catalog_path: The compiled item catalog.
+        """
+        db_path = db_path or ItemDatabase.__db_path
+        catalog_path = catalog_path or ItemDatabase.__catalog_path
+        if ItemCatalog.stale(db_path, catalog_path):
+            ItemCatalog.compile(ItemDatabase.load(db_path), catalog_path)
+        ItemDatabase.open(catalog_path)
+
+    @staticmethod
+    def catalogPath():
+        return ItemDatabase.__catalog_path
 
     @staticmethod
     def get(db_id: int) -> Item:
         """
-		Retrieves a deep copy of an item within the database.
+		Retrieves a read-only view of an item within the database.
 		:param db_id: The item's database id.
 		:return: An instance of Item class.
 		"""
-        if db_id not in range(0, len(ItemDatabase.__db)):
+        if ItemDatabase.__catalog is None:
+            ItemDatabase.initialize()
+        if db_id not in range(0, len(ItemDatabase.__catalog)):
             raise IndexError("Id '{}' is not within the bounds of the database".format(db_id))
-        return copy.deepcopy(ItemDatabase.__db[db_id])
+        return ItemDatabase.__catalog.get(db_id)
+
+    @staticmethod
+    def load(db_path: str) -> list[Item]:
+        """
+        Parses a json item database.
+        :param db_path: The json item database.
+        :return: The items, in database id order.
+        """
+        import jsons  # only needed when the catalog is rebuilt
+        with open(db_path, 'r') as itemdb:
+            return jsons.loads(itemdb.read(), cls=list[Item])
+
+    @staticmethod
+    def open(catalog_path: str):
+        """
+        Opens a compiled item catalog as the active database.
+        :param catalog_path: The compiled item catalog.
+        """
+        if ItemDatabase.__catalog is not None:
+            ItemDatabase.__catalog.close()
+        ItemDatabase.__catalog = ItemCatalog(catalog_path)
 
     @staticmethod
     def size():
-        return len(ItemDatabase.__db)
+        if ItemDatabase.__catalog is None:
+            ItemDatabase.initialize()
+        return len(ItemDatabase.__catalog)
+
+    @staticmethod
+    def sortKey(db_id: int) -> int:
+        """
+        Retrieves the precomputed name ordinal of an item, used to order items without reading their names.
+        :param db_id: The item's database id.
+        :return: The item's position when the database is ordered by name.
+        """
+        if ItemDatabase.__catalog is None:
+            ItemDatabase.initialize()
+        if db_id not in range(0, len(ItemDatabase.__catalog)):
+            raise IndexError("Id '{}' is not within the bounds of the database".format(db_id))
+        return ItemDatabase.__catalog.ordinal(db_id)
+
+    @staticmethod
+    def sourcePath():
+        return ItemDatabase.__db_path
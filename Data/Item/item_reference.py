@@ -17,4 +17,7 @@ class ItemRef:
     def __lt__(self, other):
         if not isinstance(other, ItemRef):
             return False
-        return self.item().__lt__(other.item())
+        return self.sortKey() < other.sortKey()
+
+    def sortKey(self):
+        return ItemDatabase.sortKey(self.id)
@@ -32,22 +32,22 @@ class Action:
             return False
         elif not self.requirement:
             return True
-        return self.requirement.met(player)
+        return self.requirement.predicate().met(player)
 
-    def select(self, player: Player):
+    def select(self, player: Player, selected: bool = False):
         """
-        Selects this action, consumes requirements and distributes rewards.
+        Selects this action, consumes requirements and distributes rewards. Actions are shared definitions, so
+        their selection state is tracked by the caller.
         :param player: The active player.
+        :param selected: True if the player has selected this action before.
         :return: True if scene change is required.
         """
         if not self.enabled:
             return False
-        if not self.selected:
-            if self.requirement:
-                self.requirement.consume(player)
-            if self.reward:
-                self.reward.distribute(player)
-        self.enabled = not self.disableOnSelect
-        self.removed = self.removeOnSelect
-        self.selected = True
+        if not selected:
+            with player.inventory.transaction():
+                if self.requirement:
+                    self.requirement.consume(player)
+                if self.reward:
+                    self.reward.distribute(player)
         return self.id >= -1
@@ -0,0 +1,296 @@
+import array
+import json
+import os
+import struct
+import sys
+
+from Data.Character.character import AbilityId, Character
+from Data.Scene.requirement import RequirementPredicate
+
+
+class SceneGraph:
+    """
+    Adjacency index of a world's scenes in compressed sparse row form: the actions of scene s are edges
+    offsets[s] to offsets[s + 1], with the target scene, the action's index in the scene and ids into shared tables
+    of requirements and rewards. As in the game, return actions (-1) target RETURN and actions with any lower id,
+    such as -777, stay in the scene and target the scene itself; disabled and removed actions are left out.
+
+    Built from the scenes file with the standard json module and cached next to it, so later runs only read flat
+    arrays while the scenes file is unchanged.
+    """
+    RETURN = -1
+    __magic = b"TRSG"
+    __version = 3
+    __header = struct.Struct("<4sHHIIqq")  # magic, version, reserved, scenes, edges, source size, source mtime_ns
+
+    def __init__(self, names: list[str], offsets: array.array, targets: array.array, actions: array.array,
+                 requirement_ids: array.array, reward_ids: array.array, requirements: list[tuple],
+                 rewards: list[tuple]):
+        self.names = names
+        self.offsets = offsets
+        self.targets = targets
+        self._actions = actions
+        self._requirementIds = requirement_ids
+        self._requirements = requirements  # (((ability slot, score), ...), ((item id, quantity), ...)); id 0 is none
+        self._predicates = [RequirementPredicate({AbilityId(slot): score for slot, score in abilities}, dict(items))
+                            for abilities, items in requirements]
+        self._rewardIds = reward_ids
+        self._rewards = rewards  # (experience, ((item id, quantity), ...)); id 0 is no reward
+
+    def _allowed(self, character: Character) -> list[bool]:
+        """Which requirements the character meets, or all of them when no character is given."""
+        if character is None:
+            return [True] * len(self._predicates)
+        return [predicate.met(character) for predicate in self._predicates]
+
+    def brokenLinks(self) -> list[tuple[int, int]]:
+        """
+        Lists the actions that lead to a scene that does not exist.
+        :return: (scene, action index) pairs.
+        """
+        broken = []
+        count = len(self)
+        for scene in range(count):
+            for edge in range(self.offsets[scene], self.offsets[scene + 1]):
+                if self.targets[edge] >= count:
+                    broken.append((scene, self._actions[edge]))
+        return broken
+
+    @staticmethod
+    def build(scenes: list[dict]):
+        """
+        Indexes scenes as they are stored in a scenes file.
+        :param scenes: The scenes, as parsed by the json module.
+        :return: An instance of SceneGraph.
+        """
+        names = []
+        offsets = array.array("i", [0])
+        targets = array.array("i")
+        actions = array.array("i")
+        requirement_ids = array.array("i")
+        reward_ids = array.array("i")
+        requirements = {((), ()): 0}
+        rewards = {(0, ()): 0}
+        for index, scene in enumerate(scenes):
+            names.append(scene.get("name", ""))
+            for action_index, action in enumerate(scene.get("actions") or []):
+                if not action.get("enabled", True) or action.get("removed", False):
+                    continue
+                target = action.get("id", -777)
+                targets.append(SceneGraph.RETURN if target == -1 else index if target < -1 else target)
+                actions.append(action_index)
+                requirement_ids.append(requirements.setdefault(SceneGraph._requirementKey(
+                    action.get("requirement")), len(requirements)))
+                reward_ids.append(rewards.setdefault(SceneGraph._rewardKey(action.get("reward")), len(rewards)))
+            offsets.append(len(targets))
+        return SceneGraph(names, offsets, targets, actions, requirement_ids, reward_ids, list(requirements),
+                          list(rewards))
+
+    def deadEnds(self) -> list[int]:
+        """
+        Lists the scenes that cannot be left: no action leads to another existing scene, and none returns.
+        :return: The scene indexes.
+        """
+        count = len(self)
+        dead_ends = []
+        for scene in range(count):
+            for edge in range(self.offsets[scene], self.offsets[scene + 1]):
+                target = self.targets[edge]
+                if target == SceneGraph.RETURN or (target != scene and target < count):
+                    break
+            else:
+                dead_ends.append(scene)
+        return dead_ends
+
+    def edges(self, scene: int) -> list[tuple[int, int, RequirementPredicate, tuple]]:
+        """
+        Lists the actions of a scene as edges.
+        :param scene: The scene index.
+        :return: (action index, target, requirement, reward) for each action; rewards are (experience, items).
+        """
+        return [(self._actions[edge], self.targets[edge], self._predicates[self._requirementIds[edge]],
+                 self._rewards[self._rewardIds[edge]]) for edge in range(self.offsets[scene], self.offsets[scene + 1])]
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @staticmethod
+    def load(path: str, cache: bool = True):
+        """
+        Indexes a scenes file, reading the cached index instead when it was built from the file as it is now.
+        :param path: The scenes file.
+        :param cache: When true, the index is read from and written to the path with a ".graph" suffix.
+        :return: An instance of SceneGraph.
+        """
+        stat = os.stat(path)
+        cache_path = path + ".graph"
+        if cache:
+            graph = SceneGraph._read(cache_path, stat.st_size, stat.st_mtime_ns)
+            if graph:
+                return graph
+        with open(path, 'r') as scenes_file:
+            graph = SceneGraph.build(json.load(scenes_file))
+        if cache:
+            try:
+                graph._write(cache_path, stat.st_size, stat.st_mtime_ns)
+            except OSError:  # a read-only world is still indexed, just not cached
+                pass
+        return graph
+
+    def _parents(self, start: int, character: Character, target: int = None) -> list[int]:
+        """
+        Breadth first search from a scene, following only actions whose requirement the character meets.
+        :return: Per scene, the edge it was first reached by: -1 for the start and -2 for scenes not reached.
+        Raises ValueError if the start or target is not a scene.
+        """
+        for name, scene in (("start", start), ("target", target)):
+            if scene is not None and not 0 <= scene < len(self):
+                raise ValueError("{} scene {} is not one of the {} scenes".format(name, scene, len(self)))
+        allowed = self._allowed(character)
+        offsets, targets, requirement_ids = self.offsets, self.targets, self._requirementIds
+        count = len(self)
+        parents = [-2] * count
+        parents.append(-1)  # stands in, as already reached, for return edges and links to missing scenes
+        parents[start] = -1
+        frontier = [start]
+        while frontier and (target is None or parents[target] == -2):
+            reached = []
+            for scene in frontier:
+                for edge in range(offsets[scene], offsets[scene + 1]):
+                    next_scene = targets[edge]
+                    if parents[next_scene if 0 <= next_scene < count else count] == -2 and allowed[
+                            requirement_ids[edge]]:
+                        parents[next_scene] = edge
+                        reached.append(next_scene)
+            frontier = reached
+        del parents[count]
+        return parents
+
+    def reachable(self, start: int = 0, character: Character = None) -> list[int]:
+        """
+        Lists the scenes that can be reached from a scene. Return actions only go back to scenes already reached,
+        so they are not followed.
+        :param start: The starting scene index.
+        :param character: Only follow actions whose requirement the character meets; None follows all of them.
+        Requirements are checked against the character as given: items used or rewarded on the way are not counted.
+        :return: The scene indexes, in order. Raises ValueError if the start is not a scene.
+        """
+        return [scene for scene, parent in enumerate(self._parents(start, character)) if parent != -2]
+
+    @staticmethod
+    def _read(path: str, size: int, mtime_ns: int):
+        """Reads a cached index, or returns None if there is none for the given source file stamp."""
+        try:
+            with open(path, 'rb') as graph_file:
+                data = graph_file.read()
+        except OSError:
+            return None
+        if len(data) < SceneGraph.__header.size:
+            return None
+        magic, version, _, scenes, edges, source_size, source_mtime = SceneGraph.__header.unpack_from(data, 0)
+        if (magic, version, source_size, source_mtime) != (SceneGraph.__magic, SceneGraph.__version, size,
+                                                           mtime_ns):
+            return None
+        offset = SceneGraph.__header.size
+        if len(data) < offset + (scenes + 1 + 4 * edges) * array.array("i").itemsize:
+            return None  # truncated
+        columns = []
+        for length in (scenes + 1, edges, edges, edges, edges):
+            column = array.array("i")
+            column.frombytes(data[offset:offset + length * column.itemsize])
+            if sys.byteorder != "little":
+                column.byteswap()
+            columns.append(column)
+            offset += length * column.itemsize
+        try:
+            tables = json.loads(data[offset:])
+        except ValueError:
+            return None
+        requirements = [(tuple(map(tuple, abilities)), tuple(map(tuple, items)))
+                        for abilities, items in tables["requirements"]]
+        rewards = [(experience, tuple(map(tuple, items))) for experience, items in tables["rewards"]]
+        return SceneGraph(tables["names"], *columns, requirements, rewards)
+
+    @staticmethod
+    def _requirementKey(requirement: dict) -> tuple:
+        if not requirement:
+            return (), ()
+        abilities = {}
+        for ability in requirement.get("abilities") or []:
+            ability_id = Character.abilityId(ability["name"])
+            score = ability.get("score", 1.0)
+            abilities[ability_id] = max(score, abilities.get(ability_id, score))
+        items = {}
+        for item_reference in requirement.get("items") or []:
+            items[item_reference["id"]] = max(item_reference["quantity"], items.get(item_reference["id"], 0))
+        return tuple(sorted(abilities.items())), tuple(sorted(items.items()))
+
+    @staticmethod
+    def _rewardKey(reward: dict) -> tuple:
+        if not reward:
+            return 0, ()
+        return reward.get("experience", 0), tuple((item_reference["id"], item_reference["quantity"])
+                                                  for item_reference in reward.get("items") or [])
+
+    def reward(self, scene: int, action: int) -> tuple:
+        """
+        :return: The (experience, ((item id, quantity), ...)) reward of an action, or None if it is not indexed.
+        """
+        for edge in range(self.offsets[scene], self.offsets[scene + 1]):
+            if self._actions[edge] == action:
+                return self._rewards[self._rewardIds[edge]]
+        return None
+
+    def shortestPath(self, target: int, start: int = 0, character: Character = None) -> list[tuple[int, int]]:
+        """
+        Finds a path through the fewest actions from one scene to another.
+        :param target: The scene to reach.
+        :param start: The starting scene index.
+        :param character: Only take actions whose requirement the character meets; None takes any.
+        :return: The (scene, action index) steps, empty if already there, or None if the target cannot be reached.
+        Raises ValueError if the start or target is not a scene.
+        """
+        parents = self._parents(start, character, target)
+        if parents[target] == -2:
+            return None
+        path = []
+        scene = target
+        while parents[scene] != -1:
+            edge = parents[scene]
+            scene = self._source(edge)
+            path.append((scene, self._actions[edge]))
+        path.reverse()
+        return path
+
+    def _source(self, edge: int) -> int:
+        """Finds the scene an edge belongs to by binary search over the offsets."""
+        low, high = 0, len(self) - 1
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.offsets[middle] <= edge:
+                low = middle
+            else:
+                high = middle - 1
+        return low
+
+    def unreachable(self, start: int = 0, character: Character = None) -> list[int]:
+        """
+        Lists the scenes that cannot be reached from a scene; see reachable.
+        :return: The scene indexes, in order. Raises ValueError if the start is not a scene.
+        """
+        return [scene for scene, parent in enumerate(self._parents(start, character)) if parent == -2]
+
+    def _write(self, path: str, size: int, mtime_ns: int):
+        columns = (self.offsets, self.targets, self._actions, self._requirementIds, self._rewardIds)
+        tables = {"names": self.names, "requirements": self._requirements, "rewards": self._rewards}
+        temp_path = "{}.tmp".format(path)
+        with open(temp_path, 'wb') as graph_file:
+            graph_file.write(SceneGraph.__header.pack(SceneGraph.__magic, SceneGraph.__version, 0, len(self),
+                                                      len(self.targets), size, mtime_ns))
+            for column in columns:
+                if sys.byteorder != "little":
+                    column = array.array("i", column)
+                    column.byteswap()
+                graph_file.write(column.tobytes())
+            graph_file.write(json.dumps(tables, separators=(",", ":")).encode("utf-8"))
+        os.replace(temp_path, path)
@@ -1,18 +1,87 @@
-import jsons
+import threading
 
+from Data.Game.observable import Observable
+from Data.Scene.progress import SceneProgress
 from Data.Scene.scene import Scene
+from Data.Scene.world_bundle import WorldBundle
 from Data.Character.player import Player
 
 
-class SceneManager:
+class SceneManager(Observable):
+    """
+    Publishes "scene" when the current scene changes, and "action" with the action's index when selecting an action
+    changes its state without leaving the scene.
+
+    The world's scenes are decoded on demand and the least recently used ones are let go; the current and previous
+    scenes are pinned by each manager, so they stay loaded while the session is in them.
+    """
     __default_path = "Data/scenes.json"
+    __worlds: dict[str, WorldBundle] = {}
+    __worlds_lock = threading.Lock()
 
-    def __init__(self, player: Player):
-        with open(self.__default_path, 'r') as scenes_file:
-            self.__scenes: list[Scene] = jsons.loads(scenes_file.read())
+    def __init__(self, player: Player, path: str = None):
+        self.__scenes: WorldBundle = SceneManager.world(path or self.__default_path)
+        self.__pinned: dict[int, Scene] = {}
         self.__player = player
         self.currentAreaIndex = 0
         self.previousAreaIndexes: list[int] = []  # TODO test this
+        self.progress = SceneProgress()
+        self._pin()
+
+    def actionAvailable(self, index: int):
+        """
+        Determines whether the player can select an action of the current scene.
+        :param index: The index of the action in the scene.
+        :return: True if the action is shown, enabled and its requirement is met.
+        """
+        action = self.current().getAction(index) if self.current() else None
+        return bool(action) and self.actionEnabled(index) and not self.actionRemoved(
+            index) and action.requirementMet(self.__player)
+
+    def actionDescription(self, index: int):
+        """
+        Retrieves the display text of an action of the current scene.
+        :param index: The index of the action in the scene.
+        :return: The action description.
+        """
+        action = self.current().getAction(index)
+        if action.id == -1 and self.previous():
+            return "Return to {}".format(self.previous().name)
+        return action.description
+
+    def actionEnabled(self, index: int):
+        action = self.current().getAction(index)
+        return action.enabled and not (action.disableOnSelect and self.actionSelected(index))
+
+    def actionRemoved(self, index: int):
+        action = self.current().getAction(index)
+        return action.removed or (action.removeOnSelect and self.actionSelected(index))
+
+    def actionSelected(self, index: int):
+        action = self.current().getAction(index)
+        return action.selected or self.progress.isSelected(self.currentAreaIndex, abs(index))
+
+    def adjacent(self) -> list[Scene]:
+        """
+        Lists the scenes the actions of the current scene lead to, including the previous scene for return actions.
+        :return: The scenes, without duplicates or the current scene.
+        """
+        current = self.current()
+        if not current:
+            return []
+        adjacent = []
+        seen = {id(current)}
+        for action in current.actions:
+            if action.id == -1:
+                scene = self.previous()
+            elif 0 <= action.id < len(self.__scenes):
+                scene = self.__scenes[action.id]
+            else:
+                continue
+            if scene and id(scene) not in seen:
+                seen.add(id(scene))
+                adjacent.append(scene)
+        return adjacent
 
     def areaDescription(self):
         """
@@ -24,18 +93,31 @@ class SceneManager:
         return description
 
     def copyAttributes(self, other):
-        if not isinstance(other, SceneManager):
+        """
+        Copies the scene progress of another manager, or of its saved attributes.
+        :param other: A SceneManager, or a dict of its attributes.
+        """
+        if isinstance(other, SceneManager):
+            other = {"currentAreaIndex": other.currentAreaIndex, "previousAreaIndexes": other.previousAreaIndexes,
+                     "progress": {"selected": other.progress.selected}}
+        if not isinstance(other, dict):
             self.currentAreaIndex = 0
-            self.previousAreaIndexes = 0
-            return
-        self.currentAreaIndex = other.currentAreaIndex
-        self.previousAreaIndexes = other.previousAreaIndexes
+            self.previousAreaIndexes = []
+            self.progress.clear()
+        else:
+            self.currentAreaIndex = other.get("currentAreaIndex", 0)
+            self.previousAreaIndexes = list(other.get("previousAreaIndexes", []))
+            self.progress = SceneProgress(other.get("progress", {}).get("selected"))
+        self._pin()
+        self._publish("scene")
 
     def current(self):
         """Retrieves the current area object."""
-        if self.currentAreaIndex not in range(len(self.__scenes)):
-            return None
-        return self.__scenes[self.currentAreaIndex]
+        return self._scene(self.currentAreaIndex)
+
+    @staticmethod
+    def defaultPath():
+        return SceneManager.__default_path
 
     def goto(self, index: int):
         """
@@ -45,33 +127,70 @@ class SceneManager:
         if index == self.currentAreaIndex:
             return None
         elif index == -1:
+            if not self.previousAreaIndexes:
+                return None
             temp_index = self.previousAreaIndexes[-1]
             self.previousAreaIndexes.pop()
             self.currentAreaIndex = temp_index
         elif index < len(self.__scenes):
             self.previousAreaIndexes.append(self.currentAreaIndex)
             self.currentAreaIndex = index
-
-        if self.previous():
-            self.current().setReturnAction("Return to {}".format(self.previous().name))
+        else:
+            return None
+        self._pin()
+        self._publish("scene")
         return None
 
     def previous(self):
         """Retrieves the previous area."""
         if len(self.previousAreaIndexes) <= 0:
             return None
-        if self.previousAreaIndexes[-1] not in range(
-                len(self.__scenes)) or self.previousAreaIndexes[-1] == self.currentAreaIndex:
+        if self.previousAreaIndexes[-1] == self.currentAreaIndex:
             return None
-        return self.__scenes[self.previousAreaIndexes[-1]]
+        return self._scene(self.previousAreaIndexes[-1])
+
+    def _pin(self):
+        """Keeps the current and previous scenes loaded, letting go of the ones pinned before."""
+        indexes = [self.currentAreaIndex] + self.previousAreaIndexes[-1:]
+        self.__pinned = {index: self.__scenes[index] for index in indexes if index in range(len(self.__scenes))}
+
+    def _scene(self, index: int):
+        """Retrieves a scene, or None if there is no such scene."""
+        scene = self.__pinned.get(index)
+        if scene is None and index in range(len(self.__scenes)):
+            scene = self.__scenes[index]
+        return scene
 
     def selectAction(self, index: int):
         """
         Selects a currently displayed action.
         :param index: The index of the action in the list.
+        :return: True if the action was available and has been selected.
         """
-        if self.current():
-            action = self.current().getAction(index)
-            if action.requirementMet(self.__player) and action.select(self.__player):
-                return self.goto(action.id)
-        return None
+        if not self.actionAvailable(index):
+            return False
+        action = self.current().getAction(index)
+        scene_index = self.currentAreaIndex
+        change_scene = action.select(self.__player, self.actionSelected(index))
+        self.progress.select(self.currentAreaIndex, abs(index))
+        if change_scene:
+            self.goto(action.id)
+        if self.currentAreaIndex == scene_index:
+            self._publish("action", index)
+        return True
+
+    @staticmethod
+    def world(path: str, progress=None) -> WorldBundle:
+        """
+        Retrieves the scene definitions of a world, opening its compiled bundle on first use. The scenes are shared
+        by every manager and must not be modified; session state belongs in SceneProgress. Safe to call from any
+        thread; a world being opened on one thread is waited for by the others, and is only published once it is
+        fully open.
+        :param path: The scenes file.
+        :param progress: Called with the number of scenes compiled so far and the total, if the world is compiled.
+        :return: The sequence of scenes.
+        """
+        with SceneManager.__worlds_lock:
+            if path not in SceneManager.__worlds:
+                SceneManager.__worlds[path] = WorldBundle.open(path, progress=progress)
+            return SceneManager.__worlds[path]
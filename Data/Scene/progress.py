@@ -0,0 +1,18 @@
+class SceneProgress:
+    """
+    A session's action state, kept apart from the shared scene definitions. Only selections are stored, as one
+    bitset of action indexes per touched scene; whether an action is enabled or removed follows from the
+    definition and whether it has been selected.
+    """
+
+    def __init__(self, selected: dict[int, int] = None):
+        self.selected: dict[int, int] = {int(scene): bits for scene, bits in selected.items()} if selected else {}
+
+    def clear(self):
+        self.selected.clear()
+
+    def isSelected(self, scene_index: int, action_index: int) -> bool:
+        return bool(self.selected.get(scene_index, 0) >> action_index & 1)
+
+    def select(self, scene_index: int, action_index: int):
+        self.selected[scene_index] = self.selected.get(scene_index, 0) | 1 << action_index
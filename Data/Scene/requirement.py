@@ -1,21 +1,72 @@
 from Data.Character.ability import Ability
-from Data.Character.character import Character
+from Data.Character.character import AbilityId, Character
 from Data.Item.item_reference import ItemRef
 
 
+class RequirementPredicate:
+    """
+    A requirement compiled to flat checks: abilities resolved to their score slots and items looked up by id, with
+    repeated entries merged. Also declares the abilities and items the result depends on, so callers can keep a
+    result until one of those changes.
+    """
+    __slots__ = ("abilities", "items", "_abilityChecks", "_itemChecks")
+
+    def __init__(self, ability_checks: dict[AbilityId, float], item_checks: dict[int, int]):
+        self.abilities: frozenset[str] = frozenset(ability_id.name.lower() for ability_id in ability_checks)
+        self.items: frozenset[int] = frozenset(item_checks)
+        self._abilityChecks = tuple((int(ability_id), score) for ability_id, score in ability_checks.items())
+        self._itemChecks = tuple(item_checks.items())
+
+    def met(self, character: Character) -> bool:
+        """
+        Determines whether the character meets all the requirements.
+        :param character: The character to validate.
+        :return: True if all requirements are met.
+        """
+        if self._abilityChecks:
+            scores = character.scores
+            for slot, score in self._abilityChecks:
+                if scores[slot] < score:
+                    return False
+        if self._itemChecks:
+            quantity = character.inventory.quantity
+            for item_id, required_quantity in self._itemChecks:
+                if quantity(item_id) < required_quantity:
+                    return False
+        return True
+
+
 class Requirement:
     def __init__(self, abilities: list[Ability] = None, items: list[ItemRef] = None):
         self.abilities = abilities
         self.items = items
 
+    def compile(self) -> RequirementPredicate:
+        """
+        Compiles the requirement into a predicate, which is kept for later checks. Scenes are compiled when they are
+        loaded; compile again after modifying the requirement.
+        :return: The predicate.
+        """
+        ability_checks: dict[AbilityId, float] = {}
+        for ability in self.abilities or []:
+            ability_id = Character.abilityId(ability.name)
+            ability_checks[ability_id] = max(ability.score, ability_checks.get(ability_id, ability.score))
+        item_checks: dict[int, int] = {}
+        for item_reference in self.items or []:
+            item_checks[item_reference.id] = max(item_reference.quantity,
+                                                 item_checks.get(item_reference.id, item_reference.quantity))
+        self._predicate = RequirementPredicate(ability_checks, item_checks)
+        return self._predicate
+
     def consume(self, character: Character):
         """
         Consumes the required items.
         :param character: The character using the items.
         """
         if self.items:
-            for item_reference in self.items:
-                character.use(quantity=item_reference.quantity, item_reference=item_reference)
+            with character.inventory.transaction():
+                for item_reference in self.items:
+                    character.use(quantity=item_reference.quantity, item_reference=item_reference)
 
     def met(self, character: Character):
         """
@@ -23,13 +74,8 @@ class Requirement:
         :param character: The character to validate.
         :return: True if all requirements are met.
         """
-        for ability in self.abilities:
-            if character.ability(ability.name) < ability.score:
-                return False
+        return self.predicate().met(character)
 
-        if self.items:
-            for required_item in self.items:
-                current_item = character.inventory.get(item_id=required_item.id)
-                if not current_item or current_item.quantity < required_item.quantity:
-                    return False
-        return True
+    def predicate(self) -> RequirementPredicate:
+        """The compiled requirement, compiling it on first use."""
+        return getattr(self, "_predicate", None) or self.compile()  # only set once compiled, so never saved
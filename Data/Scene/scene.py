@@ -20,8 +20,3 @@ class Scene:
         index = abs(index)
         if index < len(self.actions):
             self.actions.pop(index)
-
-    def setReturnAction(self, description: str):
-        if len(self.actions) > 0 and self.actions[-1].id == -1:
-            self.actions[-1].description = description
-            return
@@ -0,0 +1,344 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+
+from Data.Character.ability import Ability
+from Data.Item.item_reference import ItemRef
+from Data.Scene.action import Action
+from Data.Scene.requirement import Requirement
+from Data.Scene.reward import Reward
+from Data.Scene.scene import Scene
+
+
+class WorldBundle:
+    """
+    A scenes file compiled to flat tables, and a read-only sequence of its scenes that decodes them on demand.
+
+    The file is a header, an index of chunk offsets, then chunks of consecutive scenes. Each chunk holds its
+    interned strings joined by NUL, then fixed-width records of scenes, actions, requirements, rewards, abilities
+    and item refs, which refer to each other and to strings by index. A chunk is decoded with struct and builds the
+    scene objects directly, instead of reflecting the classes named in every -meta block as jsons does. Equal
+    requirements and rewards within a chunk are stored once and shared by the actions that use them.
+
+    The file is memory mapped and only the chunks that are used get decoded. The most recently used chunks are kept
+    up to a capacity; scenes still referenced elsewhere, such as a manager's current scene, keep their identity when
+    their chunk is decoded again.
+
+    The header records the source file's sha256, size and mtime; a bundle is reused while the source is unchanged.
+    """
+    __magic = b"TRWB"
+    __version = 2
+    # magic, version, reserved, source sha256, source size, source mtime_ns, scenes, scenes per chunk, chunks
+    __header = struct.Struct("<4sHH32sqqIII")
+    __stamp = struct.Struct("<qq")  # the source size and mtime_ns, within the header
+    __stamp_offset = struct.calcsize("<4sHH32s")
+    # string bytes, then the table lengths: scenes, actions, requirements, rewards, abilities, item refs
+    __chunk = struct.Struct("<IIIIIII")
+    __scene = struct.Struct("<IIIII")  # name, enter description, exit description, image path, action count
+    __action = struct.Struct("<IiBII")  # description, id, flags, requirement + 1 or 0, reward + 1 or 0
+    __requirement = struct.Struct("<IIII")  # first ability, ability count, first item ref, item ref count
+    __reward = struct.Struct("<qII")  # experience, first item ref, item ref count
+    __ability = struct.Struct("<IId")  # name, description, score
+    __item = struct.Struct("<iI")  # id, quantity
+    __disable_on_select, __enabled, __remove_on_select, __removed, __selected = 1, 2, 4, 8, 16
+    __capacity = 64  # decoded chunks kept
+    __chunk_scenes = 64
+
+    def __init__(self, path: str, capacity: int = None):
+        """
+        Opens a bundle file.
+        :param path: The bundle file; raises ValueError if it is not a bundle of this version.
+        :param capacity: The number of decoded chunks to keep.
+        """
+        with open(path, 'rb') as bundle_file:
+            self._buffer = mmap.mmap(bundle_file.fileno(), 0, access=mmap.ACCESS_READ)
+        header = WorldBundle._header(self._buffer)
+        if header is None:
+            self._buffer.close()
+            raise ValueError("'{}' is not a version {} world bundle".format(path, WorldBundle.__version))
+        self._count, self._chunkScenes, chunks = header[6:]
+        self._offsets = struct.unpack_from("<{}q".format(chunks + 1), self._buffer, WorldBundle.__header.size)
+        self._chunks: OrderedDict[int, list[Scene]] = OrderedDict()
+        self._live: weakref.WeakValueDictionary[int, Scene] = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+        self.capacity = capacity or WorldBundle.__capacity
+        self.path = path
+
+    @staticmethod
+    def bundlePath(source_path: str) -> str:
+        return source_path + ".bundle"
+
+    def _chunk(self, number: int) -> list[Scene]:
+        with self._lock:
+            scenes = self._chunks.get(number)
+            if scenes is not None:
+                self._chunks.move_to_end(number)
+                return scenes
+            start = self._offsets[number]
+            scenes = WorldBundle._decode(memoryview(self._buffer)[start:self._offsets[number + 1]])
+            first = number * self._chunkScenes
+            for offset, scene in enumerate(scenes):
+                live = self._live.get(first + offset)
+                if live is not None:
+                    scenes[offset] = live
+                else:
+                    self._live[first + offset] = scene
+            self._chunks[number] = scenes
+            while len(self._chunks) > self.capacity:
+                self._chunks.popitem(last=False)
+            return scenes
+
+    def close(self):
+        self._chunks.clear()
+        self._buffer.close()
+
+    @staticmethod
+    def compile(scenes: list[dict], path: str, source_hash: bytes = bytes(32), source_size: int = 0,
+                source_mtime_ns: int = 0, chunk_scenes: int = None, progress=None):
+        """
+        Writes scenes to a bundle file.
+        :param scenes: The scenes, as parsed from a scenes file by the json module.
+        :param path: The bundle file to write.
+        :param source_hash: The sha256 digest of the scenes file.
+        :param source_size: The scenes file's size.
+        :param source_mtime_ns: The scenes file's modification time.
+        :param chunk_scenes: The number of scenes per chunk.
+        :param progress: Called with the number of scenes encoded so far and the total after each chunk.
+        """
+        chunk_scenes = chunk_scenes or WorldBundle.__chunk_scenes
+        chunks = []
+        for first in range(0, len(scenes), chunk_scenes):
+            chunks.append(WorldBundle._encode(scenes[first:first + chunk_scenes]))
+            if progress:
+                progress(min(first + chunk_scenes, len(scenes)), len(scenes))
+        offset = WorldBundle.__header.size + struct.calcsize("<{}q".format(len(chunks) + 1))
+        offsets = [offset]
+        for chunk in chunks:
+            offset += len(chunk)
+            offsets.append(offset)
+        temp_path = "{}.tmp".format(path)
+        with open(temp_path, 'wb') as bundle_file:
+            bundle_file.write(WorldBundle.__header.pack(
+                WorldBundle.__magic, WorldBundle.__version, 0, source_hash, source_size, source_mtime_ns,
+                len(scenes), chunk_scenes, len(chunks)))
+            bundle_file.write(struct.pack("<{}q".format(len(offsets)), *offsets))
+            for chunk in chunks:
+                bundle_file.write(chunk)
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def _decode(view: memoryview) -> list[Scene]:
+        """Builds the scenes of a chunk."""
+        counts = WorldBundle.__chunk.unpack_from(view, 0)
+        string_bytes, scene_count, action_count, requirement_count, reward_count, ability_count, item_count = counts
+        offset = WorldBundle.__chunk.size
+        strings = str(view[offset:offset + string_bytes], "utf-8").split("\0")
+        offset += string_bytes
+
+        def table(record: struct.Struct, count: int):
+            nonlocal offset
+            rows = record.iter_unpack(view[offset:offset + record.size * count])
+            offset += record.size * count
+            return rows
+
+        scene_rows = table(WorldBundle.__scene, scene_count)
+        action_rows = table(WorldBundle.__action, action_count)
+        requirement_rows = list(table(WorldBundle.__requirement, requirement_count))
+        reward_rows = list(table(WorldBundle.__reward, reward_count))
+        abilities = [(strings[name], strings[description], score)
+                     for name, description, score in table(WorldBundle.__ability, ability_count)]
+        item_references = list(table(WorldBundle.__item, item_count))
+
+        requirements = [None]
+        for first_ability, ability_count, first_item, item_count in requirement_rows:
+            requirement = Requirement(
+                [Ability(*ability) for ability in abilities[first_ability:first_ability + ability_count]],
+                [ItemRef(*item) for item in item_references[first_item:first_item + item_count]])
+            requirement.compile()
+            requirements.append(requirement)
+        rewards = [None]
+        for experience, first_item, item_count in reward_rows:
+            rewards.append(Reward(experience, [ItemRef(*item) for item in
+                                               item_references[first_item:first_item + item_count]]))
+
+        disable_on_select, remove_on_select = WorldBundle.__disable_on_select, WorldBundle.__remove_on_select
+        enabled, removed, selected = WorldBundle.__enabled, WorldBundle.__removed, WorldBundle.__selected
+        scenes = []
+        for name, enter_description, exit_description, image_path, count in scene_rows:
+            actions = []
+            for _ in range(count):
+                description, action_id, flags, requirement, reward = next(action_rows)
+                action = Action(strings[description], bool(flags & disable_on_select), action_id,
+                                bool(flags & remove_on_select), requirements[requirement], rewards[reward])
+                if flags & (removed | selected) or not flags & enabled:  # the constructor sets the usual state
+                    action.enabled = bool(flags & enabled)
+                    action.removed = bool(flags & removed)
+                    action.selected = bool(flags & selected)
+                actions.append(action)
+            scenes.append(Scene(strings[name], strings[enter_description], strings[exit_description],
+                                strings[image_path], actions))
+        return scenes
+
+    @staticmethod
+    def _encode(scenes: list[dict]) -> bytes:
+        """Encodes a chunk of scenes, as parsed from a scenes file."""
+        strings: dict[str, int] = {}
+
+        def intern(text) -> int:
+            text = text or ""
+            if text not in strings:
+                if "\0" in text:
+                    raise ValueError("Scene text may not contain NUL characters: {!r}".format(text))
+                strings[text] = len(strings)
+            return strings[text]
+
+        records = {name: bytearray() for name in ("scenes", "actions", "requirements", "rewards", "abilities",
+                                                   "items")}
+        requirements: dict[tuple, int] = {}
+        rewards: dict[tuple, int] = {}
+        counts = {"abilities": 0, "items": 0}
+
+        def items(item_references) -> tuple[int, int]:
+            first = counts["items"]
+            for item_reference in item_references or []:
+                records["items"].extend(WorldBundle.__item.pack(item_reference["id"], item_reference["quantity"]))
+                counts["items"] += 1
+            return first, counts["items"] - first
+
+        def requirement(data: dict) -> int:
+            if data is None:
+                return 0
+            key = (tuple((ability["name"], ability.get("description", ""), ability.get("score", 1.0))
+                         for ability in data.get("abilities") or []),
+                   tuple((item["id"], item["quantity"]) for item in data.get("items") or []))
+            if key not in requirements:
+                first_ability = counts["abilities"]
+                for name, description, score in key[0]:
+                    records["abilities"].extend(WorldBundle.__ability.pack(intern(name), intern(description), score))
+                    counts["abilities"] += 1
+                records["requirements"].extend(WorldBundle.__requirement.pack(
+                    first_ability, len(key[0]), *items(data.get("items"))))
+                requirements[key] = len(requirements) + 1
+            return requirements[key]
+
+        def reward(data: dict) -> int:
+            if data is None:
+                return 0
+            key = (int(data.get("experience", 0)), tuple((item["id"], item["quantity"])
+                                                         for item in data.get("items") or []))
+            if key not in rewards:
+                records["rewards"].extend(WorldBundle.__reward.pack(key[0], *items(data.get("items"))))
+                rewards[key] = len(rewards) + 1
+            return rewards[key]
+
+        action_count = 0
+        for scene in scenes:
+            actions = scene.get("actions") or []
+            records["scenes"].extend(WorldBundle.__scene.pack(
+                intern(scene.get("name")), intern(scene.get("enterDescription")), intern(scene.get("exitDescription")),
+                intern(scene.get("imagePath")), len(actions)))
+            for action in actions:
+                flags = (WorldBundle.__disable_on_select * bool(action.get("disableOnSelect")) |
+                         WorldBundle.__enabled * bool(action.get("enabled", True)) |
+                         WorldBundle.__remove_on_select * bool(action.get("removeOnSelect")) |
+                         WorldBundle.__removed * bool(action.get("removed")) |
+                         WorldBundle.__selected * bool(action.get("selected")))
+                records["actions"].extend(WorldBundle.__action.pack(
+                    intern(action.get("description", "[ null ]")), action.get("id", -777), flags,
+                    requirement(action.get("requirement")), reward(action.get("reward"))))
+                action_count += 1
+
+        string_table = "\0".join(strings).encode("utf-8")
+        return b"".join((WorldBundle.__chunk.pack(len(string_table), len(scenes), action_count, len(requirements),
+                                                  len(rewards), counts["abilities"], counts["items"]),
+                         string_table, *records.values()))
+
+    def __getitem__(self, index: int) -> Scene:
+        if not 0 <= index < self._count:
+            raise IndexError("Scene {} is not within the world's {} scenes".format(index, self._count))
+        scene = self._live.get(index)
+        if scene is None:
+            scene = self._chunk(index // self._chunkScenes)[index % self._chunkScenes]
+        return scene
+
+    @staticmethod
+    def _header(data):
+        """Unpacks a bundle's header, or returns None if the data is not a bundle of this version."""
+        if len(data) < WorldBundle.__header.size:
+            return None
+        header = WorldBundle.__header.unpack_from(data, 0)
+        if header[:2] != (WorldBundle.__magic, WorldBundle.__version):
+            return None
+        return header
+
+    def __len__(self):
+        return self._count
+
+    @staticmethod
+    def open(source_path: str, bundle_path: str = None, capacity: int = None, progress=None):
+        """
+        Opens the bundle of a scenes file, compiling it first unless it was compiled from the same content. The
+        source's size and mtime are compared first so an unchanged file is not hashed.
+        :param source_path: The scenes file.
+        :param bundle_path: The bundle file; by default the scenes file's path with a ".bundle" suffix.
+        :param capacity: The number of decoded chunks to keep.
+        :param progress: Called with the number of scenes compiled so far and the total, if the bundle is compiled.
+        :return: An instance of WorldBundle, or a list of scenes if the bundle could not be written.
+        """
+        bundle_path = bundle_path or WorldBundle.bundlePath(source_path)
+        stat = os.stat(source_path)
+        header = WorldBundle._readHeader(bundle_path)
+        if header and header[4:6] == (stat.st_size, stat.st_mtime_ns):
+            return WorldBundle(bundle_path, capacity)
+        with open(source_path, 'rb') as source_file:
+            source = source_file.read()
+        source_hash = hashlib.sha256(source).digest()
+        if header and header[3] == source_hash:  # touched, or checked out again, but not changed
+            WorldBundle._restamp(bundle_path, stat.st_size, stat.st_mtime_ns)
+            return WorldBundle(bundle_path, capacity)
+        try:
+            WorldBundle.compile(json.loads(source), bundle_path, source_hash, stat.st_size, stat.st_mtime_ns,
+                                progress=progress)
+        except OSError:  # a world in a read-only directory is still loaded, the slow way
+            import jsons
+            scenes: list[Scene] = jsons.loads(source)
+            for scene in scenes:
+                for action in scene.actions:
+                    if action.requirement:
+                        action.requirement.compile()
+            return scenes
+        return WorldBundle(bundle_path, capacity)
+
+    @staticmethod
+    def _readHeader(path: str):
+        try:
+            with open(path, 'rb') as bundle_file:
+                return WorldBundle._header(bundle_file.read(WorldBundle.__header.size))
+        except OSError:
+            return None
+
+    def resident(self) -> int:
+        """The number of decoded chunks currently kept."""
+        return len(self._chunks)
+
+    @staticmethod
+    def _restamp(path: str, size: int, mtime_ns: int):
+        try:
+            with open(path, 'r+b') as bundle_file:
+                bundle_file.seek(WorldBundle.__stamp_offset)
+                bundle_file.write(WorldBundle.__stamp.pack(size, mtime_ns))
+        except OSError:
+            pass
+
+
+if __name__ == "__main__":
+    from Data.Scene.manager import SceneManager
+
+    source = sys.argv[1] if len(sys.argv) > 1 else SceneManager.defaultPath()
+    WorldBundle.open(source, sys.argv[2] if len(sys.argv) > 2 else None)
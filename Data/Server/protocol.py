@@ -0,0 +1,58 @@
+import logging
+
+from Data.Game.engine import Engine
+
+
+def dispatch(engine: Engine, line: str) -> dict:
+    """
+    Runs a single protocol request against a session. Requests are single lines ("describe", "actions",
+    "select 2", ...) answered with {"ok": true, "result": ...} or {"ok": false, "error": "..."}.
+    :param engine: The session.
+    :param line: The request line.
+    :return: The response.
+    """
+    command, _, argument = line.strip().partition(" ")
+    handler = _commands.get(command.lower())
+    if not handler:
+        return {"ok": False, "error": "Unknown command '{}'".format(command)}
+    try:
+        return {"ok": True, "result": handler(engine, argument.strip())}
+    except (IndexError, KeyError, ValueError) as error:
+        return {"ok": False, "error": str(error)}
+    except Exception as error:  # a malformed request must not end the session or the shard worker serving it
+        logging.getLogger(__name__).exception("Request '{}' failed".format(line.strip()))
+        return {"ok": False, "error": "{}: {}".format(type(error).__name__, error)}
+
+
+def _ability(engine: Engine, argument: str):
+    name, _, amount = argument.partition(" ")
+    engine.modifyAbility(name, int(amount or 1))
+    return engine.stats()
+
+
+def _actions(engine: Engine, argument: str):
+    return engine.actions()
+
+
+def _describe(engine: Engine, argument: str):
+    return engine.describe()
+
+
+def _new(engine: Engine, argument: str):
+    engine.newGame()
+    if argument:
+        engine.player.name = argument
+    return engine.stats()
+
+
+def _select(engine: Engine, argument: str):
+    changed = engine.select(int(argument))
+    return {"changed": changed, "actions": engine.actions()}
+
+
+def _stats(engine: Engine, argument: str):
+    return engine.stats()
+
+
+_commands = {"ability": _ability, "actions": _actions, "describe": _describe, "new": _new, "select": _select,
+             "stats": _stats}
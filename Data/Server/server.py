@@ -0,0 +1,92 @@
+import asyncio
+import json
+
+from Data.Game.engine import Engine
+from Data.Item.item_database import ItemDatabase
+from Data.Scene.manager import SceneManager
+from Data.Server.protocol import dispatch
+
+
+class GameServer:
+    """
+    Serves concurrent play sessions over a newline-delimited protocol on a local socket. Each connection owns one
+    Engine; see protocol.dispatch for the requests. Every request is answered with one line of json.
+    """
+    __max_line = 4096
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, idle_timeout: float = 300.0,
+                 max_sessions: int = 10000, scenes_path: str = None):
+        self.host = host
+        self.port = port
+        self.idleTimeout = idle_timeout
+        self.maxSessions = max_sessions
+        self._scenesPath = scenes_path
+        self._server: asyncio.AbstractServer = None
+        self._sessions: dict[int, Engine] = {}
+        self.requests = 0
+        self.evictions = 0
+
+    def sessions(self):
+        return len(self._sessions)
+
+    async def start(self):
+        """Loads the shared world data and starts listening."""
+        ItemDatabase.initialize()
+        SceneManager.world(self._scenesPath or SceneManager.defaultPath())
+        self._server = await asyncio.start_server(self._serve, self.host, self.port, limit=GameServer.__max_line)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serveForever(self):
+        if not self._server:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def close(self):
+        if self._server:
+            self._server.close()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        if len(self._sessions) >= self.maxSessions:
+            writer.write(self._encode({"ok": False, "error": "Server full"}))
+            await self._close(writer)
+            return
+
+        session_id = id(writer)
+        engine = Engine(scenes_path=self._scenesPath)
+        self._sessions[session_id] = engine
+        try:
+            while True:
+                try:
+                    line = await asyncio.wait_for(reader.readline(), self.idleTimeout)
+                except asyncio.TimeoutError:
+                    self.evictions += 1
+                    break
+                except (asyncio.LimitOverrunError, ValueError):
+                    writer.write(self._encode({"ok": False, "error": "Request too long"}))
+                    break
+                if not line:
+                    break
+                request = line.decode("utf-8", "replace")
+                if request.strip().lower() == "quit":
+                    break
+                self.requests += 1
+                writer.write(self._encode(dispatch(engine, request)))
+                await writer.drain()  # back-pressure: stop reading while the client is not reading
+        except ConnectionError:
+            pass
+        finally:
+            del self._sessions[session_id]
+            await self._close(writer)
+
+    @staticmethod
+    async def _close(writer: asyncio.StreamWriter):
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    @staticmethod
+    def _encode(response: dict) -> bytes:
+        return (json.dumps(response, separators=(",", ":")) + "\n").encode("utf-8")
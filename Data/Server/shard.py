@@ -0,0 +1,117 @@
+import multiprocessing
+import os
+import zlib
+
+from Data.Game.engine import Engine
+from Data.Item.item_database import ItemDatabase
+from Data.Scene.manager import SceneManager
+from Data.Server.protocol import dispatch
+
+
+def _work(connection, scenes_path: str):
+    """
+    Worker loop: receives batches of (session id, request line) and answers each batch with a list of responses.
+    :param connection: The worker's end of its pipe.
+    :param scenes_path: The scenes file shared by every session.
+    """
+    sessions: dict[str, Engine] = {}
+    while True:
+        batch = connection.recv()
+        if batch is None:
+            break
+        responses = []
+        for session_id, line in batch:
+            if line.strip().lower() == "quit":
+                sessions.pop(session_id, None)
+                responses.append({"ok": True, "result": None})
+                continue
+            engine = sessions.get(session_id)
+            if engine is None:
+                engine = sessions[session_id] = Engine(scenes_path=scenes_path)
+            responses.append(dispatch(engine, line))
+        connection.send(responses)
+    connection.close()
+
+
+class ShardedRunner:
+    """
+    Spreads play sessions over a pool of worker processes. A session always lives on the worker picked by a stable
+    hash of its id, so its Engine never moves. The world data is loaded before the workers start; where processes
+    are forked, workers share those pages with the parent instead of parsing the files again.
+    """
+
+    def __init__(self, workers: int = None, scenes_path: str = None):
+        self.workers = workers or os.cpu_count() or 1
+        self._connections = []
+        self._processes: list[multiprocessing.Process] = []
+        self._scenesPath = scenes_path or SceneManager.defaultPath()
+
+    def close(self):
+        for connection in self._connections:
+            connection.send(None)
+        for process in self._processes:
+            process.join()
+        self._connections = []
+        self._processes = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def request(self, session_id: str, line: str) -> dict:
+        """
+        Runs a single request on the session's worker.
+        :param session_id: The session, created on first use.
+        :param line: The protocol request line.
+        :return: The response.
+        """
+        return self.requestMany([(session_id, line)])[0]
+
+    def requestMany(self, requests: list[tuple[str, str]]) -> list[dict]:
+        """
+        Runs a batch of requests, one message per worker, with the workers running in parallel. Requests for the
+        same session run in the given order.
+        :param requests: (session id, request line) pairs.
+        :return: The responses, in request order.
+        """
+        batches: list[list[tuple[str, str]]] = [[] for _ in self._connections]
+        positions: list[list[int]] = [[] for _ in self._connections]
+        for position, request in enumerate(requests):
+            shard = self.shard(request[0])
+            batches[shard].append(request)
+            positions[shard].append(position)
+
+        for connection, batch in zip(self._connections, batches):
+            if batch:
+                connection.send(batch)
+        responses: list[dict] = [None] * len(requests)
+        for connection, batch, batch_positions in zip(self._connections, batches, positions):
+            if batch:
+                for position, response in zip(batch_positions, connection.recv()):
+                    responses[position] = response
+        return responses
+
+    def shard(self, session_id: str) -> int:
+        """
+        Picks the worker that owns a session.
+        :param session_id: The session id, such as the save name.
+        :return: The worker index.
+        """
+        return zlib.crc32(session_id.encode("utf-8")) % self.workers
+
+    def start(self):
+        """Loads the shared world data, then starts the workers."""
+        ItemDatabase.initialize()
+        SceneManager.world(self._scenesPath)
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        for _ in range(self.workers):
+            parent_connection, child_connection = context.Pipe()
+            process = context.Process(target=_work, args=(child_connection, self._scenesPath), daemon=True)
+            process.start()
+            child_connection.close()
+            self._connections.append(parent_connection)
+            self._processes.append(process)
@@ -0,0 +1,116 @@
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, QSize, Qt
+from PyQt5.QtGui import QIcon
+from PyQt5.QtWidgets import QApplication, QStyle, QStyledItemDelegate, QStyleOptionButton, QWidget
+
+
+class ActionListModel(QAbstractListModel):
+    """
+    The actions of the current scene that have not been removed, one row each, as described by Engine.action.
+    Rows are re-read only for actions that changed, or whose requirement depends on an ability or item that did.
+    """
+    ActionIndexRole = Qt.UserRole
+
+    def __init__(self, check_icon: QIcon, x_icon: QIcon, parent: QWidget = None):
+        super().__init__(parent)
+        self._actions: list[dict] = []
+        self._checkIcon = check_icon
+        self._getAction = None
+        self._getActions = None
+        self._rows: dict[int, int] = {}  # scene action index -> row
+        self._xIcon = x_icon
+
+    def connect(self, get_action=None, get_actions=None):
+        if get_action:
+            self._getAction = get_action
+        if get_actions:
+            self._getActions = get_actions
+
+    def data(self, index: QModelIndex, role: int = ...):
+        if not 0 <= index.row() < len(self._actions):
+            return None
+        action = self._actions[index.row()]
+        if role == Qt.DisplayRole:
+            return action["description"]
+        if role == Qt.DecorationRole:
+            if action["selected"]:
+                return self._checkIcon
+            if not action["available"]:
+                return self._xIcon
+            return None
+        if role == ActionListModel.ActionIndexRole:
+            return action["index"]
+        return None
+
+    def flags(self, index: QModelIndex):
+        if 0 <= index.row() < len(self._actions) and self._actions[index.row()]["enabled"]:
+            return Qt.ItemIsEnabled
+        return Qt.NoItemFlags
+
+    def refresh(self):
+        """Re-reads every action, after the scene changed."""
+        self.beginResetModel()
+        self._actions = self._getActions() if self._getActions else []
+        self._rows = {action["index"]: row for row, action in enumerate(self._actions)}
+        self.endResetModel()
+
+    def requirementsChanged(self, abilities, items):
+        """
+        Re-reads the actions whose requirement depends on any of the given abilities or items.
+        :param abilities: The lowercase names of the abilities whose scores changed.
+        :param items: The ids of the items whose quantities changed.
+        """
+        for action in list(self._actions):
+            if not abilities.isdisjoint(action["abilities"]) or not items.isdisjoint(action["items"]):
+                self.updateAction(action["index"])
+
+    def rowCount(self, parent: QModelIndex = ...) -> int:
+        return len(self._actions)
+
+    def updateAction(self, index: int):
+        """
+        Re-reads an action, after selecting it changed its state.
+        :param index: The action's index within the scene.
+        """
+        row = self._rows.get(index)
+        if row is None or not self._getAction:
+            return
+        action = self._getAction(index)
+        if action["removed"]:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._actions[row]
+            self._rows = {action["index"]: row for row, action in enumerate(self._actions)}
+            self.endRemoveRows()
+            return
+        self._actions[row] = action
+        self.dataChanged.emit(self.index(row), self.index(row))
+
+
+class ActionDelegate(QStyledItemDelegate):
+    """
+    Paints an action row as a push button with the action's icon and description.
+    """
+
+    def __init__(self, button_size: QSize, parent: QWidget = None):
+        super().__init__(parent)
+        self._buttonSize = button_size
+
+    def paint(self, painter, option, index: QModelIndex):
+        style = option.widget.style() if option.widget else QApplication.style()
+        button = QStyleOptionButton()
+        button.rect = option.rect.adjusted(2, 2, -2, -2)
+        button.state = QStyle.State_Raised
+        if index.flags() & Qt.ItemIsEnabled:
+            button.state |= QStyle.State_Enabled
+            if option.state & QStyle.State_MouseOver:
+                button.state |= QStyle.State_MouseOver
+        button.text = index.data() or ""
+        icon = index.data(Qt.DecorationRole)
+        if icon:
+            button.icon = icon
+            extent = style.pixelMetric(QStyle.PM_ButtonIconSize, None, option.widget)
+            button.iconSize = QSize(extent, extent)
+        button.fontMetrics = option.fontMetrics
+        style.drawControl(QStyle.CE_PushButton, button, painter, option.widget)
+
+    def sizeHint(self, option, index: QModelIndex) -> QSize:
+        return self._buttonSize
@@ -0,0 +1,114 @@
+from collections import OrderedDict
+
+from PyQt5.QtCore import QObject, QRunnable, QSize, Qt, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QImage, QImageReader, QPixmap
+
+
+class _Decoded(QObject):
+    finished = pyqtSignal(object, object)  # cache key, QImage
+
+
+class _DecodeTask(QRunnable):
+    """Reads and scales an image on a pool thread; QImage, unlike QPixmap, may be built off the gui thread."""
+
+    def __init__(self, key: tuple, signals: _Decoded):
+        super().__init__()
+        self._key = key
+        self._signals = signals
+
+    def run(self):
+        path, width, height = self._key
+        reader = QImageReader(path)
+        reader.setAutoTransform(True)
+        size = reader.size()
+        if size.isValid():  # let formats that support it decode straight to the smaller size
+            reader.setScaledSize(size.scaled(width, height, Qt.KeepAspectRatio))
+        image = reader.read()
+        if not image.isNull() and (image.width() > width or image.height() > height):
+            image = image.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        self._signals.finished.emit(self._key, image)
+
+
+class ImageCache:
+    """
+    Least recently used cache of decoded images, pre-scaled to the size they are shown at, within a byte budget.
+    Images are decoded on a thread pool; callbacks and the cache itself are only touched on the gui thread.
+    """
+    __budget = 64 * 1024 * 1024
+    __instance = None
+
+    def __init__(self, budget: int = None):
+        self.budget = budget or ImageCache.__budget
+        self._bytes = 0
+        self._decoded = _Decoded()
+        self._decoded.finished.connect(self._finished)
+        self._pending: dict[tuple, list] = {}
+        self._pixmaps: OrderedDict[tuple, QPixmap] = OrderedDict()
+        self._pool = QThreadPool.globalInstance()
+
+    def __contains__(self, key: tuple):
+        return key in self._pixmaps
+
+    def _decode(self, key: tuple):
+        if key in self._pending:
+            return
+        self._pending[key] = []
+        self._pool.start(_DecodeTask(key, self._decoded))
+
+    def _finished(self, key: tuple, image: QImage):
+        callbacks = self._pending.pop(key, [])
+        pixmap = QPixmap.fromImage(image)
+        if not pixmap.isNull():
+            self._store(key, pixmap)
+        for callback in callbacks:
+            callback(pixmap)
+
+    @staticmethod
+    def instance():
+        """The cache shared by every window; created on first use, after the QApplication exists."""
+        if ImageCache.__instance is None:
+            ImageCache.__instance = ImageCache()
+        return ImageCache.__instance
+
+    @staticmethod
+    def _key(path: str, size: QSize) -> tuple:
+        return path, size.width(), size.height()
+
+    def prefetch(self, paths, size: QSize):
+        """
+        Starts decoding images that are likely to be shown next, so they are ready when asked for.
+        :param paths: The image files.
+        :param size: The size the images will be shown at.
+        """
+        for path in paths:
+            key = ImageCache._key(path, size)
+            if path and key not in self._pixmaps:
+                self._decode(key)
+
+    def request(self, path: str, size: QSize, callback):
+        """
+        Gets an image scaled to fit a size, at once if cached or else once it has been decoded.
+        :param path: The image file.
+        :param size: The largest size to show the image at.
+        :param callback: Called on the gui thread with the QPixmap, which is null if the file could not be read.
+        """
+        key = ImageCache._key(path, size)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(key)
+            callback(pixmap)
+            return
+        if not path:
+            callback(QPixmap())
+            return
+        self._decode(key)
+        self._pending[key].append(callback)
+
+    def _store(self, key: tuple, pixmap: QPixmap):
+        if key in self._pixmaps:
+            return
+        self._pixmaps[key] = pixmap
+        self._bytes += pixmap.width() * pixmap.height() * pixmap.depth() // 8
+        while self._bytes > self.budget and len(self._pixmaps) > 1:
+            _, evicted = self._pixmaps.popitem(last=False)
+            self._bytes -= evicted.width() * evicted.height() * evicted.depth() // 8
@@ -2,6 +2,7 @@ from PyQt5.QtCore import QModelIndex, Qt, QAbstractTableModel
 from PyQt5.QtWidgets import QWidget
 
 from Data.Character.character import Character
+from Data.Item.inventory import InventoryChange
 
 
 class InventoryModel(QAbstractTableModel):
@@ -9,7 +10,7 @@ class InventoryModel(QAbstractTableModel):
         super().__init__(parent)
         self._character = character
         self._headers = ["NAME", "QTY"]
-        self._character.inventory.setOnModified(self.layoutChanged.emit)
+        self._character.inventory.setOnModified(self._inventoryModified)
 
     def columnCount(self, parent: QModelIndex = ...) -> int:
         return 2
@@ -26,6 +27,12 @@ class InventoryModel(QAbstractTableModel):
                 return "null"
             return item.name
 
+    def _inventoryModified(self, change: InventoryChange):
+        if change.layout:
+            self.layoutChanged.emit()
+        elif change.rows:
+            self.dataChanged.emit(self.index(min(change.rows), 0), self.index(max(change.rows), self.columnCount() - 1))
+
     def headerData(self, section: int, orientation: Qt.Orientation, role: int = ...):
         if role == Qt.DisplayRole:
             if orientation == Qt.Orientation.Horizontal:
@@ -3,27 +3,55 @@ from functools import partial
 from PyQt5.QtWidgets import QMainWindow
 
 from Data.UI.ui import UI
-from Data.UI.uigame import UiGame
-from Data.UI.uiload import UiLoad
-from Data.UI.uimain import UiMain
-from Data.UI.uinewgame import UiNewGame
 
 
 class UiManager:
+    """
+    Builds each window the first time it is shown or asked for, so only the main menu is built before it first
+    appears. Connections made before a window is built are applied when it is.
+    """
     __focus_window_names = ["game", "main", "new"]
 
     def __init__(self):
-        self._game = UiGame(QMainWindow())
-        self._load = UiLoad(QMainWindow())
-        self._main = UiMain(QMainWindow())
-        self._new = UiNewGame(QMainWindow())
-
-        self._all: dict[str, UI] = {"game": self._game, "load": self._load, "main": self._main, "new": self._new}
+        self._all: dict[str, UI] = {"game": None, "load": None, "main": None, "new": None}
+        self._connections: dict[str, list[dict]] = {name: [] for name in self._all}
         self._focus: UI = None
 
-        self._game.connect(show_load=partial(self.show, "load"), show_main=partial(self.show, "main"))
-        self._main.connect(goto_load=partial(self.show, "load"))
-        self._new.connect(show_main=partial(self.show, "main"))
+        self.connect("game", show_load=partial(self.show, "load"), show_main=partial(self.show, "main"))
+        self.connect("new", show_main=partial(self.show, "main"))
+
+    def _window(self, window_name: str) -> UI:
+        window: UI = self._all[window_name]
+        if window is None:
+            window = self._all[window_name] = UiManager._create(window_name)
+            for connection in self._connections.pop(window_name):
+                window.connect(**connection)
+        return window
+
+    @staticmethod
+    def _create(window_name: str) -> UI:
+        if window_name == "game":
+            from Data.UI.uigame import UiGame
+            return UiGame(QMainWindow())
+        if window_name == "load":
+            from Data.UI.uiload import UiLoad
+            return UiLoad(QMainWindow())
+        if window_name == "main":
+            from Data.UI.uimain import UiMain
+            return UiMain(QMainWindow())
+        from Data.UI.uinewgame import UiNewGame
+        return UiNewGame(QMainWindow())
+
+    def connect(self, window_name: str, **kwargs):
+        """
+        Connects a window to the game, now if it is built or else once it is.
+        :param window_name: The name of the ui window.
+        :param kwargs: The keyword arguments of the window's connect.
+        """
+        if self._all[window_name] is None:
+            self._connections[window_name].append(kwargs)
+        else:
+            self._all[window_name].connect(**kwargs)
 
     def show(self, target_window_name="main"):
         """
@@ -32,7 +60,7 @@ class UiManager:
         """
         if not self._all.keys().__contains__(target_window_name):
             target_window_name = "main"
-        target_window: UI = self._all[target_window_name]
+        target_window: UI = self._window(target_window_name)
 
         if UiManager.__focus_window_names.__contains__(target_window_name):
             self._focus = target_window
@@ -46,13 +74,13 @@ class UiManager:
     # Properties
 
     def gameMenu(self):
-        return self._game
+        return self._window("game")
 
     def loadMenu(self):
-        return self._load
+        return self._window("load")
 
     def mainMenu(self):
-        return self._main
+        return self._window("main")
 
     def newGameMenu(self):
-        return self._new
+        return self._window("new")
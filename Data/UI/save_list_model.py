@@ -0,0 +1,151 @@
+from collections import OrderedDict
+
+from PyQt5.QtCore import QAbstractListModel, QEvent, QModelIndex, QRect, QSize, Qt
+from PyQt5.QtWidgets import QApplication, QStyle, QStyledItemDelegate, QStyleOptionButton, QWidget
+
+
+class SaveListModel(QAbstractListModel):
+    """
+    The saves shown by the load menu. Rows are fetched a page at a time as the view asks for them, so only the pages
+    that have been scrolled into view are ever queried, and only a few of those are kept.
+    """
+    SaveIdRole = Qt.UserRole
+    __cached_pages = 8
+    __page_size = 50
+
+    def __init__(self, parent: QWidget = None):
+        super().__init__(parent)
+        self._countSaves = None
+        self._loadInfo = None
+        self._pages: OrderedDict[int, list[tuple[int, str]]] = OrderedDict()
+        self._total = 0
+
+    def connect(self, count_saves=None, load_info=None):
+        """
+        :param count_saves: Brings the list of saves up to date and returns the number of saves.
+        :param load_info: Lists saves a page at a time: takes an offset and a limit, and returns (save id,
+        description) pairs for the page.
+        """
+        if count_saves:
+            self._countSaves = count_saves
+        if load_info:
+            self._loadInfo = load_info
+
+    def data(self, index: QModelIndex, role: int = ...):
+        if role not in (Qt.DisplayRole, SaveListModel.SaveIdRole):
+            return None
+        row = self._row(index.row())
+        if not row:
+            return None
+        return row[0] if role == SaveListModel.SaveIdRole else row[1]
+
+    def _page(self, page: int) -> list[tuple[int, str]]:
+        rows = self._pages.get(page)
+        if rows is not None:
+            self._pages.move_to_end(page)
+            return rows
+        rows = self._loadInfo(page * SaveListModel.__page_size, SaveListModel.__page_size) if self._loadInfo else []
+        self._pages[page] = rows
+        if len(self._pages) > SaveListModel.__cached_pages:
+            self._pages.popitem(last=False)
+        return rows
+
+    def refresh(self):
+        """Brings the saves up to date, re-reads their number and drops every cached page."""
+        self.beginResetModel()
+        self._pages.clear()
+        self._total = self._countSaves() if self._countSaves else 0
+        self.endResetModel()
+
+    def removeSave(self, row: int):
+        """
+        Drops a deleted save's row, keeping the rows before it and the view's scroll position.
+        :param row: The row of the deleted save.
+        """
+        if not 0 <= row < self._total:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        first_page = row // SaveListModel.__page_size
+        for page in [page for page in self._pages if page >= first_page]:
+            del self._pages[page]
+        self._total -= 1
+        self.endRemoveRows()
+
+    def _row(self, row: int):
+        if not 0 <= row < self._total:
+            return None
+        rows = self._page(row // SaveListModel.__page_size)
+        offset = row % SaveListModel.__page_size
+        return rows[offset] if offset < len(rows) else None
+
+    def rowCount(self, parent: QModelIndex = ...) -> int:
+        return self._total
+
+
+class SaveDelegate(QStyledItemDelegate):
+    """
+    Paints a save row as its description followed by load and delete buttons, without creating any widgets.
+    Clicking a button calls back with the row's save id.
+    """
+    __margin = 10
+
+    def __init__(self, button_size: QSize, parent: QWidget = None):
+        super().__init__(parent)
+        self._buttonSize = button_size
+        self._buttonTexts = ("Load", "Delete")
+        self._delete = None
+        self._load = None
+
+    def _buttonRects(self, rect: QRect) -> tuple[QRect, QRect]:
+        margin = SaveDelegate.__margin
+        top = rect.top() + (rect.height() - self._buttonSize.height()) // 2
+        delete = QRect(rect.right() - margin - self._buttonSize.width(), top, self._buttonSize.width(),
+                       self._buttonSize.height())
+        load = delete.translated(-margin - self._buttonSize.width(), 0)
+        return load, delete
+
+    def connect(self, delete=None, load=None):
+        """
+        :param delete: Called with the save id and row when a delete button is clicked.
+        :param load: Called with the save id when a load button is clicked.
+        """
+        if delete:
+            self._delete = delete
+        if load:
+            self._load = load
+
+    def editorEvent(self, event, model, option, index: QModelIndex) -> bool:
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            save_id = index.data(SaveListModel.SaveIdRole)
+            load, delete = self._buttonRects(option.rect)
+            if save_id is not None and load.contains(event.pos()) and self._load:
+                self._load(save_id)
+                return True
+            if save_id is not None and delete.contains(event.pos()) and self._delete:
+                self._delete(save_id, index.row())
+                return True
+        return super().editorEvent(event, model, option, index)
+
+    def paint(self, painter, option, index: QModelIndex):
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawPrimitive(QStyle.PE_PanelItemViewItem, option, painter, option.widget)
+        buttons = self._buttonRects(option.rect)
+        margin = SaveDelegate.__margin
+        text_rect = QRect(option.rect.left() + margin, option.rect.top(),
+                          buttons[0].left() - option.rect.left() - 2 * margin, option.rect.height())
+        painter.save()
+        painter.setFont(option.font)
+        painter.drawText(text_rect, Qt.AlignVCenter | Qt.TextWordWrap, index.data() or "")
+        painter.restore()
+        for text, rect in zip(self._buttonTexts, buttons):
+            button = QStyleOptionButton()
+            button.rect = rect
+            button.state = QStyle.State_Enabled | QStyle.State_Raised
+            button.text = text
+            style.drawControl(QStyle.CE_PushButton, button, painter, option.widget)
+
+    def setButtonTexts(self, load: str, delete: str):
+        self._buttonTexts = (load, delete)
+
+    def sizeHint(self, option, index: QModelIndex) -> QSize:
+        return QSize(2 * self._buttonSize.width() + 200, self._buttonSize.height() + 50)
@@ -2,6 +2,8 @@ from functools import partial
 
 from PyQt5 import QtCore, QtGui, QtWidgets
 
+from Data.UI.action_list_model import ActionDelegate, ActionListModel
+from Data.UI.image_cache import ImageCache
 from Data.UI.inventory_model import InventoryModel
 from Data.UI.ui import UI
 
@@ -31,25 +33,20 @@ class UiGame(UI):  # TODO scroll area for area description
 
         self._areaActionsGroupBox = QtWidgets.QGroupBox(self._centralWidget)
         self._areaActionsGroupBox.setObjectName("areaActionsGroupBox")
-        self._areaActionsScrollArea = QtWidgets.QScrollArea(self._areaActionsGroupBox)
-        self._areaActionsScrollArea.setFrameShape(QtWidgets.QFrame.NoFrame)
-        self._areaActionsScrollArea.setWidgetResizable(True)
-        self._areaActionsScrollArea.setObjectName("areaActionsScrollArea")
-        self._areaActionsScrollAreaContent = QtWidgets.QWidget()
-        self._areaActionsScrollAreaContent.setObjectName("areaActionsScrollAreaContent")
-        self._areaActionsScrollAreaLayout = QtWidgets.QGridLayout(self._areaActionsScrollAreaContent)
-        self._areaActionsScrollAreaLayout.setObjectName("scrollAreaLayout")
-        self._areaActionButtons: list[QtWidgets.QPushButton] = []
-        for index in range(15):
-            button = QtWidgets.QPushButton(self._areaActionsScrollAreaContent)
-            button.setObjectName("areaActionButton{}".format(index))
-            button.setMinimumSize(self._defaultButtonSize)
-            self._areaActionsScrollAreaLayout.addWidget(button, index, 0, 1, 1)
-            self._areaActionButtons.append(button)
-        self._areaActionsScrollArea.setWidget(self._areaActionsScrollAreaContent)
+        self._areaActionsList = QtWidgets.QListView(self._areaActionsGroupBox)
+        self._areaActionsList.setFrameShape(QtWidgets.QFrame.NoFrame)
+        self._areaActionsList.setObjectName("areaActionsList")
+        self._areaActionsList.setMouseTracking(True)
+        self._areaActionsList.setSelectionMode(QtWidgets.QAbstractItemView.NoSelection)
+        self._areaActionsList.setUniformItemSizes(True)
+        self._areaActionsList.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollPerPixel)
+        self._areaActionsList.viewport().setAutoFillBackground(False)
+        self._areaActionsModel = ActionListModel(self._checkIcon, self._xIcon, self._areaActionsList)
+        self._areaActionsList.setModel(self._areaActionsModel)
+        self._areaActionsList.setItemDelegate(ActionDelegate(self._defaultButtonSize, self._areaActionsList))
         self._areaActionsLayout = QtWidgets.QGridLayout(self._areaActionsGroupBox)
         self._areaActionsLayout.setObjectName("areaActionsHorizontalLayout")
-        self._areaActionsLayout.addWidget(self._areaActionsScrollArea, 0, 0)
+        self._areaActionsLayout.addWidget(self._areaActionsList, 0, 0)
 
         self._playerInfoGroupBox = QtWidgets.QGroupBox(self._centralWidget)
         self._playerInfoGroupBox.setMinimumSize(QtCore.QSize(200, 200))
@@ -178,9 +175,16 @@ class UiGame(UI):  # TODO scroll area for area description
         self._menubar.addAction(self._menuFile.menuAction())
         self._menubar.addAction(self._menuWindow.menuAction())
 
-        self._getScene = None
-        self._getAreaDescription = None
+        self._adjacentImages = None
+        self._areaImagePath = None
+        self._describe = None
+        self._dirty: set[str] = set()  # parts of the window to update on the next flush
+        self._dirtyAbilities: set[str] = set()
+        self._dirtyActions: set[int] = set()
+        self._dirtyItems: set[int] = set()
+        self._flushPending = False
         self._player = None
+        self._selectAction = None
         self._action_0_0.triggered.connect(partial(self.reposition_window, 0, 0))
         self._action_100_100.triggered.connect(partial(self.reposition_window, 100, 100))  # TODO 100 & 500 -> recenter
         self._action_500_500.triggered.connect(partial(self.reposition_window, 500, 500))
@@ -188,72 +192,123 @@ class UiGame(UI):  # TODO scroll area for area description
         self._action_1280x900.triggered.connect(partial(self.resize_window, 1280, 900))
         self._action_1920x1080.triggered.connect(partial(self.resize_window, 1920, 1080))
         self._action_2560x1440.triggered.connect(partial(self.resize_window, 2560, 1440))
+        self._retranslate()
         QtCore.QMetaObject.connectSlotsByName(self._window)
 
-    def connect(self, get_area=None, get_area_description=None, player=None, save_game=None, select_action=None,
-                show_load=None, show_main=None):
-        if get_area:
-            self._getScene = get_area
-        if get_area_description:
-            self._getAreaDescription = get_area_description
+    def connect(self, adjacent_images=None, describe=None, get_action=None, get_actions=None, modify_ability=None, player=None,
+                save_game=None, scene_manager=None, select_action=None, show_load=None, show_main=None):
+        if adjacent_images:
+            self._adjacentImages = adjacent_images
+        if describe:
+            self._describe = describe
+        self._areaActionsModel.connect(get_action=get_action, get_actions=get_actions)
         if player:
             self._player = player
             self._inventoryTable.setModel(InventoryModel(player))
+            modify_ability = modify_ability or player.modifyAbilityScore
+            player.subscribe("stats", self._statsChanged)
+            player.inventory.subscribe("modified", self._inventoryChanged)
+            for abilityName in self._abilityNames:
+                abilityLabel = self._abilityWidgets[self._labelFormat.format(abilityName)]
+                abilityLabel.setToolTip(self._translate(self._window_name,
+                                                        player.ability(abilityName, "description")))
+        if modify_ability:
             for abilityName in self._abilityNames:
                 incrementButton = self._abilityWidgets[self._incrementFormat.format(abilityName)]
-                incrementButton.clicked.connect(partial(player.modifyAbilityScore, abilityName, 1))
-                incrementButton.clicked.connect(self.refresh)
+                incrementButton.clicked.connect(partial(modify_ability, abilityName, 1))
         if save_game:
             self._actionSave.triggered.connect(save_game)
+        if scene_manager:
+            scene_manager.subscribe("scene", self._sceneChanged)
+            scene_manager.subscribe("action", self._actionChanged)
         if select_action:
-            for index in range(len(self._areaActionButtons)):
-                area_action_button = self._areaActionButtons[index]
-                area_action_button.clicked.connect(partial(select_action, index))
-                area_action_button.clicked.connect(self.refresh)
+            self._selectAction = select_action
+            self._areaActionsList.clicked.connect(self._actionClicked)
         if show_load:
             self._actionLoad.triggered.connect(show_load)
         if show_main:
             self._actionQuit.triggered.connect(show_main)
 
-    def refresh(self):
-        self._window.setWindowTitle(self._translate(self._window_name, self._window_title))
-
-        scene = None
-        scene_name = ""
-        if self._getScene:
-            scene = self._getScene()
-            scene_name = scene.name
-            self._areaImage.setPixmap(QtGui.QPixmap(scene.imagePath))
-        self._areaGroupBox.setTitle(self._translate(self._window_name, scene_name))
-
-        area_description = ""
-        if self._getAreaDescription:
-            area_description = self._getAreaDescription()
-        self._areaDescriptionLabel.setText(self._translate(self._window_name, area_description))
-        self._areaActionsGroupBox.setTitle(self._translate(self._window_name, "Scene Actions"))
-
-        for index, action_button in enumerate(self._areaActionButtons):
-            if scene:
-                action = scene.getAction(index)
-                if action:
-                    if not action.removed:
-                        icon = QtGui.QIcon()
-                        if action.selected:
-                            icon = self._checkIcon
-                        elif not action.requirementMet(self._player):
-                            icon = self._xIcon
-                        action_button.setIcon(icon)
-                        action_button.setEnabled(action.enabled)
-                        action_button.setText(self._translate(self._window_name, action.description))
-                        action_button.show()
-                        continue
-            action_button.hide()
+    # Change events, applied together on the next pass of the event loop
+
+    def _actionClicked(self, index: QtCore.QModelIndex):
+        if self._selectAction and index.flags() & QtCore.Qt.ItemIsEnabled:
+            self._selectAction(index.data(ActionListModel.ActionIndexRole))
+
+    def _actionChanged(self, index: int):
+        self._dirtyActions.add(index)
+        self._markDirty("action")
+
+    def _flush(self):
+        self._flushPending = False
+        dirty, self._dirty = self._dirty, set()
+        abilities, self._dirtyAbilities = self._dirtyAbilities, set()
+        actions, self._dirtyActions = self._dirtyActions, set()
+        items, self._dirtyItems = self._dirtyItems, set()
+        if not self._window.isVisible():
+            return  # refresh brings everything up to date when the window is shown
+        if "scene" in dirty:
+            self._refreshScene()
+            self._areaActionsModel.refresh()
+        else:
+            for index in actions:
+                self._areaActionsModel.updateAction(index)
+            if "requirements" in dirty:
+                self._areaActionsModel.requirementsChanged(abilities, items)
+        if "stats" in dirty:
+            self._refreshStats(abilities)
+
+    def _inventoryChanged(self, change):
+        self._dirtyItems.update(change.items)
+        self._markDirty("requirements")
+
+    def _markDirty(self, *parts: str):
+        self._dirty.update(parts)
+        if not self._flushPending:
+            self._flushPending = True
+            QtCore.QTimer.singleShot(0, self._flush)
+
+    def _sceneChanged(self):
+        self._markDirty("scene")
+
+    def _statsChanged(self, abilities: tuple[str, ...]):
+        self._dirtyAbilities.update(abilities)
+        if abilities:
+            self._markDirty("stats", "requirements")
+        else:
+            self._markDirty("stats")
+
+    # Widget updates
 
+    def refresh(self):
+        self._dirty.clear()
+        self._dirtyAbilities.clear()
+        self._dirtyActions.clear()
+        self._dirtyItems.clear()
         playerInfoGroupBoxTitle = "Player Info"
         if self._player:
             playerInfoGroupBoxTitle = self._player.name
         self._playerInfoGroupBox.setTitle(self._translate(self._window_name, playerInfoGroupBoxTitle))
+        self._refreshScene()
+        self._areaActionsModel.refresh()
+        self._refreshStats([abilityName.lower() for abilityName in self._abilityNames])
+
+    def _refreshScene(self):
+        scene_name = ""
+        area_description = ""
+        if self._describe:
+            scene = self._describe()
+            scene_name = scene["name"]
+            area_description = scene["description"]
+            self._showAreaImage(scene["image"])
+        self._areaGroupBox.setTitle(self._translate(self._window_name, scene_name))
+        self._areaDescriptionLabel.setText(self._translate(self._window_name, area_description))
 
+    def _refreshStats(self, abilities):
+        """
+        Updates the player's stats.
+        :param abilities: The lowercase names of the abilities whose scores changed.
+        """
         levelText = "LVL: {}"
         expText = "EXP: {} / {}"
         powerText = "POWER: {}"
@@ -281,27 +336,31 @@ class UiGame(UI):  # TODO scroll area for area description
         if self._player:
             ap = self._player.ability_points
         self._abilityPointsLabel.setText(self._translate(self._window_name, "AP: {}".format(ap)))
-        labelText = "{}:"
         scoreText = "{}"
-        incrementText = "+"
         for abilityName in self._abilityNames:
-            abilityDescription = ""
-            abilityScore = -1
-            if self._player:
-                abilityDescription = self._player.ability(abilityName, "description")
-                abilityScore = self._player.ability(abilityName)
-            abilityLabel = self._abilityWidgets[self._labelFormat.format(abilityName)]
-            abilityLabel.setText(self._translate(self._window_name, labelText.format(abilityName[0:3].upper())))
-            abilityLabel.setToolTip(self._translate(self._window_name, abilityDescription))
+            incrementButton = self._abilityWidgets[self._incrementFormat.format(abilityName)]
+            incrementButton.setEnabled(ap > 0)
+            if abilityName.lower() not in abilities:
+                continue
+            abilityScore = self._player.ability(abilityName) if self._player else -1
             abilityScoreLabel = self._abilityWidgets[self._scoreFormat.format(abilityName)]
             abilityScoreLabel.setText(self._translate(self._window_name, scoreText.format(abilityScore)))
-            if abilityScore >= self._player.maxAbilityScore():
+            if self._player and abilityScore >= self._player.maxAbilityScore():
                 abilityScoreLabel.setStyleSheet(self._greenStyleSheet)
+            else:
+                abilityScoreLabel.setStyleSheet(self._boldStyleSheet)
+
+    def _retranslate(self):
+        """Sets the text that never changes."""
+        self._window.setWindowTitle(self._translate(self._window_name, self._window_title))
+        self._areaActionsGroupBox.setTitle(self._translate(self._window_name, "Scene Actions"))
+        labelText = "{}:"
+        incrementText = "+"
+        for abilityName in self._abilityNames:
+            abilityLabel = self._abilityWidgets[self._labelFormat.format(abilityName)]
+            abilityLabel.setText(self._translate(self._window_name, labelText.format(abilityName[0:3].upper())))
             incrementButton = self._abilityWidgets[self._incrementFormat.format(abilityName)]
             incrementButton.setText(self._translate(self._window_name, incrementText))
-            incrementButton.setEnabled(ap > 0)
-
-        self._inventoryTable.update()
 
         self._menuFile.setTitle(self._translate(self._window_name, "File"))
         self._menuWindow.setTitle(self._translate(self._window_name, "Window"))
@@ -326,3 +385,15 @@ class UiGame(UI):  # TODO scroll area for area description
         self._actionSave.setShortcut(self._translate(self._window_name, "Ctrl+S"))
         self._actionQuit.setText(self._translate(self._window_name, "Quit to Menu"))
         self._actionQuit.setShortcut(self._translate(self._window_name, "Ctrl+Q"))
+
+    def _showAreaImage(self, path: str):
+        """Shows a scene image from the cache, then starts decoding the images of the scenes the player may go to."""
+        self._areaImagePath = path
+        size = self._areaImage.size() * self._areaImage.devicePixelRatioF()
+        ImageCache.instance().request(path, size, partial(self._areaImageDecoded, path))
+        if self._adjacentImages:
+            ImageCache.instance().prefetch(self._adjacentImages(), size)
+
+    def _areaImageDecoded(self, path: str, pixmap: QtGui.QPixmap):
+        if path == self._areaImagePath:  # the player may have moved on while it was decoding
+            self._areaImage.setPixmap(pixmap)
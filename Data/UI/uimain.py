@@ -3,11 +3,13 @@ import random
 
 from PyQt5 import QtCore, QtGui, QtWidgets
 
+from Data.UI.image_cache import ImageCache
 from Data.UI.ui import UI
 
 
 class UiMain(UI):
     __splash_dir = "Data/Images/Scene/"
+    __splash_files: list[str] = None
 
     def __init__(self, window: QtWidgets.QMainWindow):
         super().__init__(window, window_name="MainWindow", window_show_size=QtCore.QSize(800, 600),
@@ -28,6 +30,13 @@ class UiMain(UI):
         self._exitGameButton = QtWidgets.QPushButton(self._centralWidget)
         self._exitGameButton.setFixedSize(self._largeButtonSize)
         self._exitGameButton.setObjectName("exitGameButton")
+        self._loadingLabel = QtWidgets.QLabel(self._centralWidget)
+        self._loadingLabel.setAlignment(QtCore.Qt.AlignCenter)
+        self._loadingLabel.setObjectName("loadingLabel")
+        self._loadingBar = QtWidgets.QProgressBar(self._centralWidget)
+        self._loadingBar.setTextVisible(False)
+        self._loadingBar.setObjectName("loadingBar")
+        self.hideProgress()
 
         self._centralWidgetLayout = QtWidgets.QGridLayout(self._centralWidget)
         self._centralWidgetLayout.setObjectName("centralWidgetLayout")
@@ -35,6 +44,8 @@ class UiMain(UI):
         self._centralWidgetLayout.addWidget(self._newGameButton, 2, 1, 1, 1)
         self._centralWidgetLayout.addWidget(self._loadGameButton, 3, 1, 1, 1)
         self._centralWidgetLayout.addWidget(self._exitGameButton, 4, 1, 1, 1)
+        self._centralWidgetLayout.addWidget(self._loadingLabel, 5, 0, 1, 3)
+        self._centralWidgetLayout.addWidget(self._loadingBar, 6, 0, 1, 3)
         self._centralWidget.setLayout(self._centralWidgetLayout)
         self._window.setCentralWidget(self._centralWidget)
 
@@ -47,18 +58,47 @@ class UiMain(UI):
         if goto_new:
             self._newGameButton.clicked.connect(goto_new)
 
+    def hideProgress(self):
+        self._loadingLabel.hide()
+        self._loadingBar.hide()
+
     def randomSplash(self):
-        files = os.listdir(self.__splash_dir)
-        fileName = ""
-        if files:
-            fileName = files[random.randint(0, len(files) - 1)]
+        if UiMain.__splash_files is None:  # the directory is listed once per run
+            UiMain.__splash_files = os.listdir(self.__splash_dir) if os.path.isdir(self.__splash_dir) else []
+        files = UiMain.__splash_files
+        if not files:
+            return ""
+        fileName = files[random.randint(0, len(files) - 1)]
         path = "{}/{}".format(self.__splash_dir, fileName)
         return path
 
     def refresh(self):
         _translate = QtCore.QCoreApplication.translate
         self._window.setWindowTitle(_translate(self._window_name, self._window_title))
-        self._mainSplash.setPixmap(QtGui.QPixmap(self.randomSplash()))
+        size = self._window.size() * self._window.devicePixelRatioF()
+        ImageCache.instance().request(self.randomSplash(), size, self._mainSplash.setPixmap)
         self._newGameButton.setText(_translate(self._window_name, "New Game"))
         self._loadGameButton.setText(_translate(self._window_name, "Load Game"))
         self._exitGameButton.setText(_translate(self._window_name, "Exit Game"))
+
+    def showMessage(self, message: str):
+        """
+        Shows a message below the menu buttons in place of the loading progress.
+        :param message: The message.
+        """
+        self._loadingLabel.setText(message)
+        self._loadingLabel.show()
+        self._loadingBar.hide()
+
+    def showProgress(self, message: str, done: int = 0, total: int = 0):
+        """
+        Shows what is being loaded below the menu buttons.
+        :param message: What is being loaded.
+        :param done: The amount loaded so far.
+        :param total: The amount to load, or 0 to show that loading is busy without knowing how long it will take.
+        """
+        self._loadingLabel.setText(message)
+        self._loadingLabel.show()
+        self._loadingBar.setRange(0, total)
+        self._loadingBar.setValue(done)
+        self._loadingBar.show()
@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from Benchmarks.experience_curve import levelOneAtATime
+from Data.Character.experience_curve import ExperienceCurve, LinearCurve, TableCurve
+from Data.Character.player import Player
+from Data.Character.population import Population
+
+
+class QuadraticCurve(ExperienceCurve):
+    """A formula curve that only defines required(), so it exercises the generic total() and level()."""
+
+    def required(self, level: int):
+        return 10 * level * level
+
+
+_curves = [LinearCurve(50), TableCurve([random.Random(0).randint(10, 500) for _ in range(40)]), QuadraticCurve()]
+
+
+@pytest.fixture(params=_curves, ids=lambda curve: type(curve).__name__)
+def curve(request):
+    previous = Player.experienceCurve()
+    Player.setExperienceCurve(request.param)
+    yield request.param
+    Player.setExperienceCurve(previous)
+
+
+def test_add_experience_matches_levelling_one_at_a_time(curve):
+    rng = random.Random(0)
+    players = []
+    expected = []
+    grants = []
+    for _ in range(2000):
+        level = rng.randint(1, 60)
+        experience = rng.randrange(curve.required(level) * 2)  # sometimes already past the requirement
+        grant = rng.choice((0, rng.randrange(-500, 500), rng.randrange(10 ** 4), rng.randrange(10 ** 6)))
+        player = Player(level=level, experience=experience)
+        reference = Player(level=level, experience=experience)
+        player.addExperience(grant)
+        levelOneAtATime(curve, reference, grant)
+        assert (player.level, player.experience, player.ability_points) == (
+            reference.level, reference.experience, reference.ability_points), (level, experience, grant)
+        players.append(Player(level=level, experience=experience))
+        expected.append(reference)
+        grants.append(grant)
+
+    population = Population.fromPlayers(players)
+    population.addExperience(grants)
+    for index, reference in enumerate(expected):
+        copy = population.player(index)
+        assert (copy.level, copy.experience, copy.ability_points) == (
+            reference.level, reference.experience, reference.ability_points), index
+
+
+def test_level_inverts_total(curve):
+    for level in range(1, 200):
+        total = curve.total(level)
+        assert curve.level(total) == level
+        assert curve.level(total + curve.required(level) - 1) == level
+
+
+def test_curve_without_required_cannot_be_created():
+    class Incomplete(ExperienceCurve):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
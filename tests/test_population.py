@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+from Benchmarks.population import syntheticPlayers
+from Data.Character.ability import Ability
+from Data.Character.character import Character
+from Data.Character.population import Population
+
+
+@pytest.fixture
+def rng():
+    return random.Random(0)
+
+
+@pytest.fixture
+def players(rng):
+    return syntheticPlayers(2000, rng)
+
+
+@pytest.mark.parametrize("name", ["craftingBonus", "dodgeBonus", "enchantingBonus", "runBonus", "powerLevel",
+                                  "requiredExperience"])
+def test_derived_stats_match_players(players, name):
+    population = Population.fromPlayers(players)
+    assert getattr(population, name)().tolist() == [getattr(player, name)() for player in players]
+
+
+def test_meets_matches_players(players, rng):
+    population = Population.fromPlayers(players)
+    for _ in range(20):
+        requirement = [Ability(name, "", rng.randint(0, 10)) for name in rng.sample(Character.abilityNames(), 2)]
+        expected = [all(player.ability(ability.name) >= ability.score for ability in requirement)
+                    for player in players]
+        assert population.meets(requirement).tolist() == expected
+
+
+def test_add_experience_matches_players(players, rng):
+    population = Population.fromPlayers(players)
+    grants = [rng.choice((0, rng.randrange(100), -rng.randrange(5000))) for _ in players]
+    for player, experience in zip(players, grants):
+        player.addExperience(experience)
+    population.addExperience(grants)
+    for index, player in enumerate(players):
+        copy = population.player(index)
+        assert (copy.level, copy.experience, copy.ability_points, copy.scores) == (
+            player.level, player.experience, player.ability_points, player.scores), index
@@ -1,3 +1,5 @@
+import sys
+
 from Data.Game.game import Game
 
-game = Game()
+sys.exit(Game().run())
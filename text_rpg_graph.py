@@ -0,0 +1,93 @@
+import argparse
+import sys
+import time
+
+from Data.Character.character import Character
+from Data.Character.player import Player
+from Data.Item.inventory import Inventory
+from Data.Item.item_reference import ItemRef
+from Data.Scene.graph import SceneGraph
+from Data.Scene.manager import SceneManager
+
+
+def abilityScore(text: str) -> tuple[str, float]:
+    name, _, score = text.partition("=")
+    try:
+        Character.abilityId(name)
+        return name, float(score)
+    except (KeyError, ValueError):
+        raise argparse.ArgumentTypeError("expected ABILITY=SCORE with one of {}".format(
+            ", ".join(Character.abilityNames())))
+
+
+def itemQuantity(text: str) -> ItemRef:
+    item_id, _, quantity = text.partition(":")
+    try:
+        return ItemRef(int(item_id), int(quantity or 1))
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected ITEM_ID[:QUANTITY]")
+
+
+def listed(scenes: list, limit: int) -> str:
+    shown = ", ".join(str(scene) for scene in scenes[:limit])
+    return shown + (", ... ({} more)".format(len(scenes) - limit) if len(scenes) > limit else "")
+
+
+parser = argparse.ArgumentParser(description="Checks a world's scene graph: which scenes can be reached, which "
+                                             "cannot be left and which actions lead nowhere. Exits with status 1 "
+                                             "when scenes are unreachable or links are broken.")
+parser.add_argument("scenes", nargs="?", default=SceneManager.defaultPath(), help="the scenes file")
+parser.add_argument("--start", type=int, default=0, help="the scene new games start in")
+parser.add_argument("--ability", type=abilityScore, action="append", default=[], metavar="ABILITY=SCORE",
+                    help="check requirements against a player with this score; others stay at the starting score")
+parser.add_argument("--item", type=itemQuantity, action="append", default=[], metavar="ITEM_ID[:QUANTITY]",
+                    help="check requirements against a player carrying this item")
+parser.add_argument("--path", type=int, metavar="SCENE", help="show the shortest way to a scene")
+parser.add_argument("--limit", type=int, default=20, help="scene indexes listed per report")
+parser.add_argument("--no-cache", action="store_true", help="re-read the scenes file even if its index is cached")
+args = parser.parse_args()
+
+start_time = time.perf_counter()
+graph = SceneGraph.load(args.scenes, cache=not args.no_cache)
+print("Indexed {} scenes and {} actions in {:.0f} ms".format(len(graph), len(graph.targets),
+                                                            (time.perf_counter() - start_time) * 1000))
+for option, scene in (("--start", args.start), ("--path", args.path)):
+    if scene is not None and not 0 <= scene < len(graph):
+        parser.error("{} {} is not a scene; the world has scenes 0 to {}".format(option, scene, len(graph) - 1))
+
+player = None
+if args.ability or args.item:
+    player = Player(inventory=Inventory(max(len(args.item), 1)))
+    for name, score in args.ability:
+        player.setAbilityScore(Character.abilityId(name), score)
+    try:
+        player.inventory.put(*args.item)
+    except IndexError as error:
+        parser.error("--item: {}".format(error))
+    print("Requirements are checked against {}".format(
+        ", ".join(["{} {}".format(name, score) for name, score in args.ability] +
+                  ["item {} x{}".format(item.id, item.quantity) for item in args.item])))
+else:
+    print("Requirements are ignored; pass --ability or --item to check them")
+
+query_time = time.perf_counter()
+unreachable = graph.unreachable(args.start, player)
+dead_ends = graph.deadEnds()
+broken_links = graph.brokenLinks()
+print("Reachable from scene {}: {}".format(args.start, len(graph) - len(unreachable)))
+print("Unreachable: {}{}".format(len(unreachable), ": " + listed(unreachable, args.limit) if unreachable else ""))
+print("Dead ends: {}{}".format(len(dead_ends), ": " + listed(dead_ends, args.limit) if dead_ends else ""))
+print("Broken links: {}{}".format(len(broken_links), ": " + listed(
+    ["scene {} action {}".format(*link) for link in broken_links], args.limit) if broken_links else ""))
+
+if args.path is not None:
+    path = graph.shortestPath(args.path, args.start, player)
+    if path is None:
+        print("Scene {} cannot be reached from scene {}".format(args.path, args.start))
+    else:
+        print("Shortest path to scene {} ({}), {} actions:".format(args.path, graph.names[args.path], len(path)))
+        for scene, action in path:
+            print("  scene {} ({}): action {}".format(scene, graph.names[scene], action))
+print("Queries took {:.0f} ms".format((time.perf_counter() - query_time) * 1000))
+
+sys.exit(1 if unreachable or broken_links else 0)
@@ -0,0 +1,23 @@
+import argparse
+import asyncio
+
+from Data.Server.server import GameServer
+
+
+async def main(server: GameServer):
+    await server.start()
+    print("Listening on {}:{}".format(server.host, server.port), flush=True)
+    await server.serveForever()
+
+
+parser = argparse.ArgumentParser(description="Serves Text RPG play sessions over a local line protocol.")
+parser.add_argument("--host", default="127.0.0.1")
+parser.add_argument("--port", type=int, default=8765, help="0 picks a free port")
+parser.add_argument("--idle-timeout", type=float, default=300.0, help="seconds before an idle session is closed")
+parser.add_argument("--max-sessions", type=int, default=10000)
+args = parser.parse_args()
+
+try:
+    asyncio.run(main(GameServer(args.host, args.port, args.idle_timeout, args.max_sessions)))
+except KeyboardInterrupt:
+    pass